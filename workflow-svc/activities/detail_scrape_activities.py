@@ -2,7 +2,7 @@
 Temporal activities for detail scraping workflow
 """
 import os
-import json
+import orjson
 import logging
 import traceback
 import httpx
@@ -10,6 +10,8 @@ from datetime import datetime, timezone
 from typing import List, Dict, Any, Optional
 from temporalio import activity
 from aio_pika import Message, DeliveryMode
+from sqlalchemy import select, func, exists, literal_column
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 
 from database import SessionLocal
 from models import JobListing, JobListingGolden
@@ -24,6 +26,12 @@ logger = logging.getLogger(__name__)
 SCRAPER_URL = os.getenv("SCRAPER_URL", "http://scraper:6000")
 SCRAPER_TIMEOUT = 60.0  # 60 seconds per job scrape
 
+# Skip raw jobs whose golden record is already detail-scraped. Set to "false"
+# to force a full re-scrape (e.g. after a scraper fix).
+SKIP_COMPLETED_DETAIL_SCRAPES = os.getenv("SKIP_COMPLETED_DETAIL_SCRAPES", "true").lower() == "true"
+
+_golden = JobListingGolden.__table__
+
 
 @activity.defn
 async def get_jobs_chunk_info(chunk_size: int = 100) -> Dict[str, Any]:
@@ -79,6 +87,11 @@ async def fetch_jobs_chunk(offset: int, limit: int) -> List[Dict[str, Any]]:
     """
     Fetch a specific chunk of jobs for detail scraping.
 
+    Chunks are offsets over all raw jobs (ordered by id) so they stay stable
+    while golden rows are written. Jobs already detail-scraped are dropped
+    from the chunk with an anti-join on the golden posting_url index, so
+    repeat runs only scrape the delta.
+
     Args:
         offset: Starting position
         limit: Number of jobs to fetch
@@ -90,8 +103,23 @@ async def fetch_jobs_chunk(offset: int, limit: int) -> List[Dict[str, Any]]:
     try:
         print(f"[Detail Scrape Activity] Fetching chunk: offset={offset}, limit={limit}...", flush=True)
 
-        jobs = db.query(JobListing).offset(offset).limit(limit).all()
-        print(f"[Detail Scrape Activity] Query returned {len(jobs)} jobs", flush=True)
+        chunk_ids = (
+            select(JobListing.id)
+            .order_by(JobListing.id)
+            .offset(offset)
+            .limit(limit)
+            .scalar_subquery()
+        )
+        query = db.query(JobListing).filter(JobListing.id.in_(chunk_ids))
+
+        if SKIP_COMPLETED_DETAIL_SCRAPES:
+            query = query.filter(~exists().where(
+                JobListingGolden.posting_url == JobListing.posting_url,
+                JobListingGolden.detail_scrape_status == 'completed'
+            ))
+
+        jobs = query.order_by(JobListing.id).all()
+        print(f"[Detail Scrape Activity] Query returned {len(jobs)} jobs needing detail scrape", flush=True)
 
         result = []
         for job in jobs:
@@ -220,82 +248,94 @@ async def save_detail_scraped_job(job: Dict[str, Any]) -> bool:
         posting_url = job['posting_url']
         logger.info(f"[Detail Scrape Activity] 💾 Saving detail-scraped job: {job.get('company_title')} - {job.get('job_role')}")
 
-        # Check if record already exists
-        existing = db.query(JobListingGolden).filter(
-            JobListingGolden.posting_url == posting_url
-        ).first()
-
         now = datetime.now(timezone.utc)
+        detail_scrape_status = 'completed' if job.get('detail_scrape_success') else 'failed'
+        detail_scrape_errors = {'error': job.get('detail_scrape_error')} if job.get('detail_scrape_error') else None
+
+        # New record with raw job data + full page text for AI enrichment
+        stmt = pg_insert(_golden).values(
+            source_job_id=job.get('id'),
+            posting_url=posting_url,
+
+            # Core fields from raw job
+            company_title=job.get('company_title'),
+            job_role=job.get('job_role'),
+            job_location_raw=job.get('job_location'),
+            employment_type_raw=job.get('employment_type'),
+            salary_range_raw=job.get('salary_range'),
+            min_salary_raw=job.get('min_salary'),
+            max_salary_raw=job.get('max_salary'),
+            required_experience=job.get('required_experience'),
+            seniority_level_raw=job.get('seniority_level'),
+
+            # Detail scraped fields - the full content for AI to process
+            job_description_full=job.get('job_description_full'),
+            full_page_text=job.get('full_page_text'),
+
+            # Original data from card scrape
+            about_company_raw=job.get('about_company'),
+            hiring_team_raw=job.get('hiring_team'),
+
+            # Metadata from raw
+            date_posted=job.get('date_posted'),
+            scraper_source=job.get('scraper_source'),
+            scraped_at=datetime.fromisoformat(job['scraped_at']) if job.get('scraped_at') else None,
+
+            # Detail scrape metadata
+            detail_scraped_at=now,
+            detail_scrape_status=detail_scrape_status,
+            detail_scrape_duration_ms=job.get('detail_scrape_duration_ms'),
+            detail_scrape_errors=detail_scrape_errors,
 
-        if existing:
-            # Update existing record with detail scrape data
-            # We only store the full description and page text - AI will extract everything else
-            existing.job_description_full = job.get('job_description_full')
-            existing.full_page_text = job.get('full_page_text')
+            # Set enrichment status to pending (ready for AI enrichment)
+            enrichment_status='pending' if job.get('detail_scrape_success') else None,
+        )
 
-            # Preserve original fields from raw job
-            if not existing.hiring_team_raw and job.get('hiring_team'):
-                existing.hiring_team_raw = job.get('hiring_team')
-            if not existing.about_company_raw and job.get('about_company'):
-                existing.about_company_raw = job.get('about_company')
+        # Existing record: only take the detail scrape data. We only store the
+        # full description and page text - AI will extract everything else.
+        # ON CONFLICT doesn't apply onupdate defaults, so updated_at is explicit.
+        excluded = stmt.excluded
+        set_values = {
+            'job_description_full': excluded.job_description_full,
+            'full_page_text': excluded.full_page_text,
 
             # Detail scrape metadata
-            existing.detail_scraped_at = now
-            existing.detail_scrape_status = 'completed' if job.get('detail_scrape_success') else 'failed'
-            existing.detail_scrape_duration_ms = job.get('detail_scrape_duration_ms')
-            if job.get('detail_scrape_error'):
-                existing.detail_scrape_errors = {'error': job.get('detail_scrape_error')}
+            'detail_scraped_at': excluded.detail_scraped_at,
+            'detail_scrape_status': excluded.detail_scrape_status,
+            'detail_scrape_duration_ms': excluded.detail_scrape_duration_ms,
+            'updated_at': now,
+        }
 
-            # Set enrichment status to pending (ready for AI enrichment)
-            if job.get('detail_scrape_success') and not existing.enrichment_status:
-                existing.enrichment_status = 'pending'
+        # Preserve original fields from raw job - only fill them in if empty
+        if job.get('hiring_team'):
+            set_values['hiring_team_raw'] = func.coalesce(
+                func.nullif(_golden.c.hiring_team_raw, ''), excluded.hiring_team_raw
+            )
+        if job.get('about_company'):
+            set_values['about_company_raw'] = func.coalesce(
+                func.nullif(_golden.c.about_company_raw, ''), excluded.about_company_raw
+            )
 
-            db.commit()
-            logger.info(f"[Detail Scrape Activity] ✅ Updated existing golden record for {posting_url}")
+        if detail_scrape_errors:
+            set_values['detail_scrape_errors'] = excluded.detail_scrape_errors
 
-        else:
-            # Create new record with raw job data + full page text for AI enrichment
-            golden_job = JobListingGolden(
-                source_job_id=job.get('id'),
-                posting_url=posting_url,
-
-                # Core fields from raw job
-                company_title=job.get('company_title'),
-                job_role=job.get('job_role'),
-                job_location_raw=job.get('job_location'),
-                employment_type_raw=job.get('employment_type'),
-                salary_range_raw=job.get('salary_range'),
-                min_salary_raw=job.get('min_salary'),
-                max_salary_raw=job.get('max_salary'),
-                required_experience=job.get('required_experience'),
-                seniority_level_raw=job.get('seniority_level'),
-
-                # Detail scraped fields - the full content for AI to process
-                job_description_full=job.get('job_description_full'),
-                full_page_text=job.get('full_page_text'),
-
-                # Original data from card scrape
-                about_company_raw=job.get('about_company'),
-                hiring_team_raw=job.get('hiring_team'),
-
-                # Metadata from raw
-                date_posted=job.get('date_posted'),
-                scraper_source=job.get('scraper_source'),
-                scraped_at=datetime.fromisoformat(job['scraped_at']) if job.get('scraped_at') else None,
-
-                # Detail scrape metadata
-                detail_scraped_at=now,
-                detail_scrape_status='completed' if job.get('detail_scrape_success') else 'failed',
-                detail_scrape_duration_ms=job.get('detail_scrape_duration_ms'),
-                detail_scrape_errors={'error': job.get('detail_scrape_error')} if job.get('detail_scrape_error') else None,
-
-                # Set enrichment status to pending (ready for AI enrichment)
-                enrichment_status='pending' if job.get('detail_scrape_success') else None,
+        # Set enrichment status to pending (ready for AI enrichment) unless already set
+        if job.get('detail_scrape_success'):
+            set_values['enrichment_status'] = func.coalesce(
+                func.nullif(_golden.c.enrichment_status, ''), 'pending'
             )
 
-            db.add(golden_job)
-            db.commit()
+        # One round trip either way; xmax is 0 only on a freshly inserted row
+        inserted = db.execute(
+            stmt.on_conflict_do_update(index_elements=[_golden.c.posting_url], set_=set_values)
+            .returning(literal_column('xmax') == 0)
+        ).scalar_one()
+        db.commit()
+
+        if inserted:
             logger.info(f"[Detail Scrape Activity] ✅ Created new golden record for {posting_url}")
+        else:
+            logger.info(f"[Detail Scrape Activity] ✅ Updated existing golden record for {posting_url}")
 
         return True
 
@@ -332,7 +372,7 @@ async def publish_detail_scraped_jobs(jobs: List[Dict[str, Any]]) -> int:
                 continue
 
             message = Message(
-                body=json.dumps(job).encode(),
+                body=orjson.dumps(job),
                 delivery_mode=DeliveryMode.PERSISTENT,
                 content_type="application/json",
                 headers={
@@ -367,21 +407,27 @@ async def get_detail_scrape_stats() -> Dict[str, Any]:
     """
     db = SessionLocal()
     try:
-        total_raw = db.query(JobListing).count()
-        total_golden = db.query(JobListingGolden).count()
-        detail_scraped = db.query(JobListingGolden).filter(
-            JobListingGolden.detail_scrape_status == 'completed'
-        ).count()
-        detail_failed = db.query(JobListingGolden).filter(
-            JobListingGolden.detail_scrape_status == 'failed'
-        ).count()
-        pending_enrichment = db.query(JobListingGolden).filter(
-            JobListingGolden.detail_scrape_status == 'completed',
-            JobListingGolden.enrichment_status == 'pending'
-        ).count()
-        enriched = db.query(JobListingGolden).filter(
-            JobListingGolden.enrichment_status == 'completed'
-        ).count()
+        # All counts in one statement with conditional aggregation
+        (
+            total_raw,
+            total_golden,
+            detail_scraped,
+            detail_failed,
+            pending_enrichment,
+            enriched,
+        ) = db.execute(
+            select(
+                select(func.count()).select_from(JobListing).scalar_subquery(),
+                func.count(),
+                func.count().filter(JobListingGolden.detail_scrape_status == 'completed'),
+                func.count().filter(JobListingGolden.detail_scrape_status == 'failed'),
+                func.count().filter(
+                    JobListingGolden.detail_scrape_status == 'completed',
+                    JobListingGolden.enrichment_status == 'pending'
+                ),
+                func.count().filter(JobListingGolden.enrichment_status == 'completed'),
+            ).select_from(JobListingGolden)
+        ).one()
 
         return {
             'total_raw_jobs': total_raw,
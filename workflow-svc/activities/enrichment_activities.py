@@ -1,7 +1,7 @@
 """
 Temporal activities for job listing enrichment workflow
 """
-import json
+import orjson
 import logging
 from typing import List, Dict, Any
 from temporalio import activity
@@ -130,7 +130,7 @@ async def fetch_and_publish_enrichment_chunk(offset: int, limit: int, skip_alrea
             }
 
             message = Message(
-                body=json.dumps(job_data).encode(),
+                body=orjson.dumps(job_data),
                 delivery_mode=DeliveryMode.PERSISTENT,
                 content_type="application/json",
                 headers={
@@ -261,7 +261,7 @@ async def publish_to_raw_jobs_queue(jobs: List[Dict[str, Any]]) -> int:
 
         for idx, job in enumerate(jobs, 1):
             message = Message(
-                body=json.dumps(job).encode(),
+                body=orjson.dumps(job),
                 delivery_mode=DeliveryMode.PERSISTENT,
                 content_type="application/json",
                 headers={
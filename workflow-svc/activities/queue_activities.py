@@ -3,7 +3,7 @@ RabbitMQ activities for publishing scraped job listings
 """
 from temporalio import activity
 from typing import Dict, Any, List
-import json
+import orjson
 from aio_pika import Message, DeliveryMode
 from queue_config import get_rabbitmq_channel, JOBS_EXCHANGE, JOBS_QUEUE
 
@@ -37,7 +37,7 @@ async def publish_scrape_results(scraper: str, results: List[Dict[str, Any]]) ->
 
             # Create persistent message
             message = Message(
-                body=json.dumps(message_data).encode(),
+                body=orjson.dumps(message_data),
                 delivery_mode=DeliveryMode.PERSISTENT,  # Survive broker restart
                 content_type="application/json",
                 headers={
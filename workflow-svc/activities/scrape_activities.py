@@ -2,11 +2,8 @@ from temporalio import activity
 from typing import Dict, Any, List
 import httpx
 import os
-from sqlalchemy.orm import Session
-from sqlalchemy.exc import IntegrityError
-from database import SessionLocal
-from models.job_listing import JobListing
 from datetime import datetime, timezone
+from db import get_pool, bulk_upsert_job_listings, job_listing_record
 
 SCRAPER_URL = os.getenv("SCRAPER_URL", "http://scraper:6000")
 
@@ -63,6 +60,10 @@ async def store_scrape_results(scraper: str, results: List[Dict[str, Any]]) -> i
     """
     Activity to store scraping results in the database
 
+    ScrapeWorkflow doesn't call this - it publishes pages to the scraped_jobs
+    queue, and the raw-job consumer (consumer.py) stores them through the same
+    COPY helper. Kept registered for storing results without the queue.
+
     Args:
         scraper: Name of the scraper (source)
         results: List of job listings to store
@@ -70,64 +71,24 @@ async def store_scrape_results(scraper: str, results: List[Dict[str, Any]]) -> i
     Returns:
         Number of jobs stored (excluding duplicates)
     """
-    db: Session = SessionLocal()
-    stored_count = 0
-    duplicate_count = 0
-
     try:
         activity.logger.info(f"Storing {len(results)} job listings from {scraper}")
 
-        for job_data in results:
-            try:
-                # Note: scraper returns camelCase fields (e.g., postingUrl)
-                posting_url = job_data.get("postingUrl")
-
-                # Create new job listing
-                # Map camelCase fields from scraper to snake_case fields in database
-                job_listing = JobListing(
-                    company_title=job_data.get("companyTitle", ""),
-                    job_role=job_data.get("jobRole", ""),
-                    job_location=job_data.get("jobLocation"),
-                    employment_type=job_data.get("employmentType"),
-                    salary_range=job_data.get("salaryRange"),
-                    min_salary=job_data.get("minSalary"),
-                    max_salary=job_data.get("maxSalary"),
-                    required_experience=job_data.get("requiredExperience"),
-                    seniority_level=job_data.get("seniorityLevel"),
-                    job_description=job_data.get("jobDescription"),
-                    date_posted=job_data.get("datePosted"),
-                    posting_url=posting_url,
-                    hiring_team=job_data.get("hiringTeam"),
-                    about_company=job_data.get("aboutCompany"),
-                    scraper_source=scraper,
-                    scraped_at=datetime.now(timezone.utc)
-                )
-
-                db.add(job_listing)
-                db.flush()  # Flush to catch IntegrityError immediately
-                stored_count += 1
-                activity.logger.info(
-                    f"Inserted new job listing: {job_data.get('companyTitle')} - "
-                    f"{job_data.get('jobRole')} ({posting_url})"
-                )
+        # Map camelCase fields from scraper to job_listings records
+        scraped_at = datetime.now(timezone.utc)
+        rows = [job_listing_record(job_data, scraper, scraped_at) for job_data in results]
 
-            except IntegrityError:
-                # Handle unique constraint violation (duplicate job listing)
-                db.rollback()
-                activity.logger.debug(f"Duplicate job listing skipped: {posting_url}")
-                duplicate_count += 1
-                continue
+        # COPY into staging + single INSERT ... ON CONFLICT DO NOTHING
+        pool = await get_pool()
+        async with pool.acquire() as conn:
+            stored_count = await bulk_upsert_job_listings(conn, rows)
 
-        db.commit()
         activity.logger.info(
             f"Successfully stored {stored_count} new job listings from {scraper} "
-            f"({duplicate_count} duplicates skipped)"
+            f"({len(rows) - stored_count} duplicates skipped)"
         )
         return stored_count
 
     except Exception as e:
-        db.rollback()
         activity.logger.error(f"Failed to store scrape results: {str(e)}")
         raise
-    finally:
-        db.close()
@@ -7,6 +7,8 @@ import sys
 
 # Add the parent directory to the path so we can import our models
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+# ...and this directory so migrations can import `helpers`
+sys.path.insert(0, os.path.dirname(__file__))
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -18,16 +20,18 @@ if config.config_file_name is not None:
     fileConfig(config.config_file_name)
 
 # Import Base and models
-from database import Base
+from database import Base, postgres_dsn
 from models import JobListing, WorkflowRun
 
 # Set target metadata for autogenerate support
 target_metadata = Base.metadata
 
-# Override sqlalchemy.url with environment variable if present
+# Override sqlalchemy.url with environment variable if present.
+# Migrations always run on the sync driver, whichever driver the URL names.
+# '%' is escaped for the ini-style interpolation of config options.
 database_url = os.getenv("DATABASE_URL")
 if database_url:
-    config.set_main_option("sqlalchemy.url", database_url)
+    config.set_main_option("sqlalchemy.url", postgres_dsn(database_url).replace("%", "%%"))
 
 
 def run_migrations_offline() -> None:
@@ -0,0 +1,4 @@
+# Migration helpers
+from .batch_update import batch_update, run_batch_update
+
+__all__ = ["batch_update", "run_batch_update"]
@@ -0,0 +1,67 @@
+"""
+Batched data migration helper
+
+Backfills on wide tables like job_listings_golden should not run as a single
+unbounded UPDATE: that holds row locks on every touched row until the
+migration's transaction ends. batch_update() applies the change in chunks and
+commits after each one instead.
+"""
+import logging
+
+from alembic import op
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+logger = logging.getLogger("alembic.helpers.batch_update")
+
+
+def batch_update(conn: Connection, sql: str, batch_size: int = 1000, **params) -> int:
+    """
+    Run an UPDATE repeatedly in batches, committing after each batch.
+
+    The statement must limit itself with :batch_size, exclude rows it has
+    already updated, and return one row per updated row, e.g.:
+
+        UPDATE job_listings_golden SET enrichment_status = 'pending'
+        WHERE id IN (
+            SELECT id FROM job_listings_golden
+            WHERE enrichment_status IS NULL AND detail_scrape_status = 'completed'
+            LIMIT :batch_size
+        )
+        RETURNING 1
+
+    Call it inside op.get_context().autocommit_block() so each batch is
+    committed on its own rather than inside Alembic's migration transaction.
+
+    Args:
+        conn: Connection from op.get_bind()
+        sql: Batched UPDATE statement (see above)
+        batch_size: Rows per batch
+        **params: Extra bind parameters for the statement
+
+    Returns:
+        Total number of rows updated
+    """
+    statement = text(sql)
+    total = 0
+
+    while True:
+        result = conn.execute(statement, {"batch_size": batch_size, **params})
+        updated = len(result.fetchall())
+        conn.commit()
+
+        if updated == 0:
+            break
+
+        total += updated
+        logger.info(f"Batch updated {updated} rows ({total} total)")
+
+    return total
+
+
+def run_batch_update(sql: str, batch_size: int = 1000, **params) -> int:
+    """
+    Convenience wrapper for use inside a migration's upgrade()/downgrade()
+    """
+    with op.get_context().autocommit_block():
+        return batch_update(op.get_bind(), sql, batch_size, **params)
@@ -111,7 +111,7 @@ def upgrade() -> None:
     sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
 
     sa.PrimaryKeyConstraint('id'),
-    sa.ForeignKeyConstraint(['source_job_id'], ['job_listings.id'], ),
+    # FK to job_listings is added in 005, after data is loaded
     )
 
     # Create indexes
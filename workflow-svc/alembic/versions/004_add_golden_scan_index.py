@@ -0,0 +1,35 @@
+"""add golden scan index
+
+Revision ID: 004
+Revises: 003
+Create Date: 2025-12-21 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '004'
+down_revision = '003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Composite covering index for the "jobs from scraper X needing enrichment" scan.
+    # INCLUDE (id, posting_url) lets Postgres answer the scan with an index-only pass
+    # instead of bitmap-ANDing the two single-column indexes and visiting the heap.
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_golden_scan "
+        "ON job_listings_golden (scraper_source, enrichment_status, updated_at) "
+        "INCLUDE (id, posting_url)"
+    )
+
+    # scraper_source is now the leading column of ix_golden_scan, so the
+    # single-column index is redundant
+    op.drop_index(op.f('ix_job_listings_golden_scraper_source'), table_name='job_listings_golden')
+
+
+def downgrade() -> None:
+    op.create_index(op.f('ix_job_listings_golden_scraper_source'), 'job_listings_golden', ['scraper_source'], unique=False)
+    op.execute("DROP INDEX IF EXISTS ix_golden_scan")
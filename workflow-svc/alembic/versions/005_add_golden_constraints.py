@@ -0,0 +1,42 @@
+"""add golden constraints
+
+Revision ID: 005
+Revises: 004
+Create Date: 2025-12-22 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '005'
+down_revision = '004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Databases created before this revision got an unnamed inline FK from 002
+    op.execute(
+        "ALTER TABLE job_listings_golden "
+        "DROP CONSTRAINT IF EXISTS job_listings_golden_source_job_id_fkey"
+    )
+
+    # Two-phase FK creation: NOT VALID only takes a brief lock and skips the scan,
+    # VALIDATE then checks existing rows under a lock that still allows writes.
+    # Each runs in its own transaction so the stronger lock isn't held during validation.
+    with op.get_context().autocommit_block():
+        op.execute(
+            "ALTER TABLE job_listings_golden ADD CONSTRAINT fk_golden_source "
+            "FOREIGN KEY (source_job_id) REFERENCES job_listings(id) NOT VALID"
+        )
+        op.execute("ALTER TABLE job_listings_golden VALIDATE CONSTRAINT fk_golden_source")
+
+
+def downgrade() -> None:
+    op.drop_constraint('fk_golden_source', 'job_listings_golden', type_='foreignkey')
+    op.create_foreign_key(
+        'job_listings_golden_source_job_id_fkey',
+        'job_listings_golden', 'job_listings',
+        ['source_job_id'], ['id']
+    )
@@ -0,0 +1,39 @@
+"""add enrichment version trigger
+
+Revision ID: 006
+Revises: 005
+Create Date: 2025-12-23 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '006'
+down_revision = '005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Bump enrichment_version server-side so the golden consumer's UPDATEs carry
+    # only plain values. UPDATE OF enriched_at limits it to enrichment writes -
+    # the golden consumer always sets enriched_at, detail scraping never does.
+    op.execute(
+        "CREATE OR REPLACE FUNCTION bump_enrichment_version() RETURNS trigger AS $$ "
+        "BEGIN "
+        "NEW.enrichment_version := COALESCE(OLD.enrichment_version, 0) + 1; "
+        "RETURN NEW; "
+        "END; "
+        "$$ LANGUAGE plpgsql"
+    )
+    op.execute(
+        "CREATE TRIGGER trg_golden_enrichment_version "
+        "BEFORE UPDATE OF enriched_at ON job_listings_golden "
+        "FOR EACH ROW EXECUTE FUNCTION bump_enrichment_version()"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS trg_golden_enrichment_version ON job_listings_golden")
+    op.execute("DROP FUNCTION IF EXISTS bump_enrichment_version()")
@@ -0,0 +1,38 @@
+"""add enrichment pending index
+
+Revision ID: 007
+Revises: 006
+Create Date: 2025-12-24 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '007'
+down_revision = '006'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Partial index over just the enrichment work queue - detail-scraped rows not
+    # yet enriched. The predicate matches the enrichment activities' filter, and
+    # keying on id serves their ORDER BY id OFFSET/LIMIT paging and the count.
+    # CONCURRENTLY can't run in a transaction, and avoids blocking writers.
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_golden_enrichment_pending "
+            "ON job_listings_golden (id) "
+            "WHERE detail_scrape_status = 'completed' "
+            "AND (enrichment_status = 'pending' OR enrichment_status IS NULL)"
+        )
+
+        # Nothing filters on enrichment_status alone any more - the work queue
+        # uses the partial index, per-scraper scans use ix_golden_scan
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_job_listings_golden_enrichment_status")
+
+
+def downgrade() -> None:
+    op.create_index(op.f('ix_job_listings_golden_enrichment_status'), 'job_listings_golden', ['enrichment_status'], unique=False)
+    op.execute("DROP INDEX IF EXISTS ix_golden_enrichment_pending")
@@ -1,16 +1,18 @@
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import ORJSONResponse, Response
 from pydantic import BaseModel
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Tuple
 import os
-import uuid
+import time
+import asyncio
+import secrets
 import logging
-from datetime import datetime, timezone
+import orjson
+from contextlib import asynccontextmanager
+from sqlalchemy import select, func
 from temporalio.client import Client
-from workflows.scrape_workflow import ScrapeWorkflow
-from workflows.enrichment_workflow import EnrichmentWorkflow
-from workflows.detail_scrape_workflow import DetailScrapeWorkflow
 from models import JobListing, JobListingGolden
-from database import SessionLocal
+from database import AsyncSessionLocal, async_engine, warm_async_pool
 from const import MAX_PAGES
 
 # Configure logging
@@ -20,12 +22,91 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-app = FastAPI(title="Workflow Service", version="1.0.0")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Connect to Temporal once at startup and share the client across requests"""
+    # Run new tasks eagerly until their first await (Python 3.12+)
+    if hasattr(asyncio, "eager_task_factory"):
+        asyncio.get_running_loop().set_task_factory(asyncio.eager_task_factory)
+
+    app.state.temporal_client = None
+    try:
+        await get_temporal_client()
+    except Exception as e:
+        # Don't block startup - get_temporal_client() retries on the next request
+        logger.warning(f"Could not connect to Temporal at startup: {str(e)}")
+
+    try:
+        await warm_async_pool()
+    except Exception as e:
+        # Pool connects lazily anyway - a cold first request is the only cost
+        logger.warning(f"Could not warm database pool at startup: {str(e)}")
+    yield
+    await async_engine.dispose()
+
+
+app = FastAPI(
+    title="Workflow Service",
+    version="1.0.0",
+    default_response_class=ORJSONResponse,  # orjson serializes responses in C
+    lifespan=lifespan,
+)
 
 # Temporal configuration
 TEMPORAL_ADDRESS = os.getenv("TEMPORAL_ADDRESS", "localhost:7233")
 TEMPORAL_TASK_QUEUE = os.getenv("TEMPORAL_TASK_QUEUE", "job-gtm-queue")
 
+# Workflow type names as registered by the worker (@workflow.defn defaults to
+# the class name). Starting by name keeps the workflow modules - and the
+# activity code they pull in - out of the API process.
+SCRAPE_WORKFLOW = "ScrapeWorkflow"
+ENRICHMENT_WORKFLOW = "EnrichmentWorkflow"
+DETAIL_SCRAPE_WORKFLOW = "DetailScrapeWorkflow"
+
+# Map Temporal workflow status to our status
+WORKFLOW_STATUS_MAP = {
+    "RUNNING": "running",
+    "COMPLETED": "completed",
+    "FAILED": "failed",
+    "CANCELED": "canceled",
+    "TERMINATED": "terminated",
+    "CONTINUED_AS_NEW": "running",
+    "TIMED_OUT": "timed_out"
+}
+
+# Guards the lazy Temporal connect so concurrent requests don't each open one
+_temporal_client_lock = asyncio.Lock()
+
+
+async def get_temporal_client() -> Client:
+    """
+    Get the shared Temporal client, connecting on first use.
+    The underlying gRPC channel multiplexes concurrent requests.
+    """
+    client = getattr(app.state, "temporal_client", None)
+    if client is not None:
+        return client
+    async with _temporal_client_lock:
+        if getattr(app.state, "temporal_client", None) is None:
+            logger.info(f"Connecting to Temporal at {TEMPORAL_ADDRESS}")
+            app.state.temporal_client = await Client.connect(TEMPORAL_ADDRESS)
+            logger.info("Connected to Temporal successfully")
+        return app.state.temporal_client
+
+def _new_workflow_id(prefix: str) -> str:
+    """
+    Unique, roughly time-ordered workflow ID: <prefix>-<ns timestamp hex>-<8 random hex>.
+    No datetime formatting or UUID string building on the trigger path.
+    """
+    return f"{prefix}-{time.time_ns():x}-{secrets.token_hex(4)}"
+
+# Workflow status cache - terminal statuses never change, running ones are
+# served from cache for a short TTL to absorb UI polling
+TERMINAL_WORKFLOW_STATUSES = frozenset({"completed", "failed", "canceled", "terminated", "timed_out"})
+STATUS_CACHE_TTL_SECONDS = float(os.getenv("STATUS_CACHE_TTL_SECONDS", "2.0"))
+STATUS_CACHE_MAX_ENTRIES = int(os.getenv("STATUS_CACHE_MAX_ENTRIES", "1000"))
+
 # Request/Response models
 class AIWorkflowRequest(BaseModel):
     job_listings: list
@@ -53,48 +134,74 @@ class WorkflowStatusResponse(BaseModel):
     status: str
     result: Optional[Dict[str, Any]] = None
 
+class WorkflowStatusBatchRequest(BaseModel):
+    ids: List[str]
+
+# In-process status cache: workflow_id -> (cached_at monotonic, response, final).
+# `final` responses are terminal and complete, so they never expire
+_status_cache: Dict[str, Tuple[float, WorkflowStatusResponse, bool]] = {}
+# In-flight describe() calls, shared by concurrent requests for the same workflow
+_status_inflight: Dict[str, "asyncio.Task[WorkflowStatusResponse]"] = {}
+
+# Fixed bodies are serialized once at import; hot handlers return
+# ORJSONResponse directly, skipping response_model validation and jsonable_encoder
+_ROOT_BODY = orjson.dumps({
+    "service": "Workflow Service",
+    "version": "1.0.0",
+    "temporal_address": TEMPORAL_ADDRESS
+})
+_HEALTHY_BODY = orjson.dumps({
+    "status": "healthy",
+    "temporal": "connected"
+})
+
+# Keeps WorkflowResponse in the OpenAPI schema without validating every response
+_WORKFLOW_STARTED_DOC = {200: {"model": WorkflowResponse}}
+
+
+def _workflow_started(workflow_id: str, run_id: str) -> ORJSONResponse:
+    """Response body for the trigger endpoints"""
+    return ORJSONResponse({
+        "workflow_id": workflow_id,
+        "run_id": run_id,
+        "status": "started"
+    })
+
+
 @app.get("/")
 async def root():
-    return {
-        "service": "Workflow Service",
-        "version": "1.0.0",
-        "temporal_address": TEMPORAL_ADDRESS
-    }
+    return Response(content=_ROOT_BODY, media_type="application/json")
 
 @app.get("/health")
 async def health():
     try:
-        # Try to connect to Temporal
-        client = await Client.connect(TEMPORAL_ADDRESS)
-        return {
-            "status": "healthy",
-            "temporal": "connected"
-        }
+        # Check the shared Temporal connection
+        client = await get_temporal_client()
+        await client.service_client.check_health()
+        return Response(content=_HEALTHY_BODY, media_type="application/json")
     except Exception as e:
-        return {
+        return ORJSONResponse({
             "status": "unhealthy",
             "temporal": "disconnected",
             "error": str(e)
-        }
+        })
 
-@app.post("/workflows/scrape/trigger", response_model=WorkflowResponse)
+@app.post("/workflows/scrape/trigger", responses=_WORKFLOW_STARTED_DOC)
 async def trigger_scrape_workflow():
     """
     Trigger the scraping workflow to scrape all available scrapers
     No parameters required - workflow will discover and scrape all available scrapers
     """
     try:
-        logger.info(f"Connecting to Temporal at {TEMPORAL_ADDRESS}")
-        client = await Client.connect(TEMPORAL_ADDRESS)
-        logger.info("Connected to Temporal successfully")
+        client = await get_temporal_client()
 
         # Generate unique workflow ID
-        workflow_id = f"scrape-all-{datetime.now(timezone.utc).strftime('%Y%m%d-%H%M%S')}-{str(uuid.uuid4())[:8]}"
+        workflow_id = _new_workflow_id("scrape-all")
         logger.info(f"Starting workflow with ID: {workflow_id}")
 
         # Start the scraping workflow
         handle = await client.start_workflow(
-            ScrapeWorkflow.run,
+            SCRAPE_WORKFLOW,
             id=workflow_id,
             task_queue=TEMPORAL_TASK_QUEUE,
             # max_pages defaults to MAX_PAGES in the workflow
@@ -104,16 +211,12 @@ async def trigger_scrape_workflow():
         logger.info(f"Task Queue: {TEMPORAL_TASK_QUEUE}")
         logger.info(f"View workflow in Temporal UI: http://localhost:8233/namespaces/default/workflows/{handle.id}")
 
-        return WorkflowResponse(
-            workflow_id=handle.id,
-            run_id=handle.result_run_id,
-            status="started"
-        )
+        return _workflow_started(handle.id, handle.result_run_id)
     except Exception as e:
         logger.error(f"Failed to start workflow: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Failed to start workflow: {str(e)}")
 
-@app.post("/workflows/scrape/trigger/{scraper}", response_model=WorkflowResponse)
+@app.post("/workflows/scrape/trigger/{scraper}", responses=_WORKFLOW_STARTED_DOC)
 async def trigger_single_scraper_workflow(scraper: str):
     """
     Trigger the scraping workflow for a specific scraper
@@ -125,17 +228,15 @@ async def trigger_single_scraper_workflow(scraper: str):
         WorkflowResponse with workflow_id, run_id, and status
     """
     try:
-        logger.info(f"Connecting to Temporal at {TEMPORAL_ADDRESS}")
-        client = await Client.connect(TEMPORAL_ADDRESS)
-        logger.info("Connected to Temporal successfully")
+        client = await get_temporal_client()
 
         # Generate unique workflow ID
-        workflow_id = f"scrape-{scraper}-{datetime.now(timezone.utc).strftime('%Y%m%d-%H%M%S')}-{str(uuid.uuid4())[:8]}"
+        workflow_id = _new_workflow_id(f"scrape-{scraper}")
         logger.info(f"Starting workflow with ID: {workflow_id} for scraper: {scraper}")
 
         # Start the scraping workflow with specific scraper
         handle = await client.start_workflow(
-            ScrapeWorkflow.run,
+            SCRAPE_WORKFLOW,
             id=workflow_id,
             task_queue=TEMPORAL_TASK_QUEUE,
             args=[MAX_PAGES, scraper],  # max_pages=MAX_PAGES, scraper_name=scraper
@@ -146,35 +247,27 @@ async def trigger_single_scraper_workflow(scraper: str):
         logger.info(f"Scraper: {scraper}")
         logger.info(f"View workflow in Temporal UI: http://localhost:8233/namespaces/default/workflows/{handle.id}")
 
-        return WorkflowResponse(
-            workflow_id=handle.id,
-            run_id=handle.result_run_id,
-            status="started"
-        )
+        return _workflow_started(handle.id, handle.result_run_id)
     except Exception as e:
         logger.error(f"Failed to start workflow for scraper {scraper}: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Failed to start workflow: {str(e)}")
 
-@app.post("/workflows/ai", response_model=WorkflowResponse)
+@app.post("/workflows/ai", responses=_WORKFLOW_STARTED_DOC)
 async def start_ai_workflow(request: AIWorkflowRequest):
     """
     Start an AI processing workflow in Temporal
     """
     try:
-        client = await Client.connect(TEMPORAL_ADDRESS)
+        client = await get_temporal_client()
 
         # TODO: Start the AI workflow with Temporal
         # For now, return a placeholder response
 
-        return WorkflowResponse(
-            workflow_id=f"ai-{request.model_type}-placeholder",
-            run_id="placeholder-run-id",
-            status="started"
-        )
+        return _workflow_started(f"ai-{request.model_type}-placeholder", "placeholder-run-id")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to start workflow: {str(e)}")
 
-@app.post("/workflows/enrich/trigger", response_model=WorkflowResponse)
+@app.post("/workflows/enrich/trigger", responses=_WORKFLOW_STARTED_DOC)
 async def trigger_enrichment_workflow(request: EnrichmentRequest = EnrichmentRequest()):
     """
     Trigger the enrichment workflow to process all existing job listings
@@ -191,15 +284,13 @@ async def trigger_enrichment_workflow(request: EnrichmentRequest = EnrichmentReq
         skip_already_enriched: Skip jobs already in golden table (default: True)
     """
     try:
-        logger.info(f"Connecting to Temporal at {TEMPORAL_ADDRESS}")
-        client = await Client.connect(TEMPORAL_ADDRESS)
-        logger.info("Connected to Temporal successfully")
+        client = await get_temporal_client()
 
-        workflow_id = f"enrich-all-{datetime.now(timezone.utc).strftime('%Y%m%d-%H%M%S')}-{str(uuid.uuid4())[:8]}"
+        workflow_id = _new_workflow_id("enrich-all")
         logger.info(f"Starting enrichment workflow with ID: {workflow_id}")
 
         handle = await client.start_workflow(
-            EnrichmentWorkflow.run,
+            ENRICHMENT_WORKFLOW,
             id=workflow_id,
             task_queue=TEMPORAL_TASK_QUEUE,
             args=[request.batch_size, request.skip_already_enriched]
@@ -208,11 +299,7 @@ async def trigger_enrichment_workflow(request: EnrichmentRequest = EnrichmentReq
         logger.info(f"Enrichment workflow started: {workflow_id}")
         logger.info(f"View workflow in Temporal UI: http://localhost:8233/namespaces/default/workflows/{handle.id}")
 
-        return WorkflowResponse(
-            workflow_id=handle.id,
-            run_id=handle.result_run_id,
-            status="started"
-        )
+        return _workflow_started(handle.id, handle.result_run_id)
     except Exception as e:
         logger.error(f"Failed to start enrichment workflow: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
@@ -224,12 +311,15 @@ async def get_enrichment_status():
     Get current enrichment pipeline status
     Returns counts of jobs in each stage
     """
-    db = SessionLocal()
     try:
-        total_jobs = db.query(JobListing).count()
-        enriched_jobs = db.query(JobListingGolden).filter(
-            JobListingGolden.enrichment_status == 'completed'
-        ).count()
+        async with AsyncSessionLocal() as db:
+            # One round-trip: raw count as a scalar subquery + filtered golden count
+            total_jobs, enriched_jobs = (await db.execute(
+                select(
+                    select(func.count()).select_from(JobListing).scalar_subquery(),
+                    func.count().filter(JobListingGolden.enrichment_status == 'completed'),
+                ).select_from(JobListingGolden)
+            )).one()
 
         return {
             "total_jobs": total_jobs,
@@ -241,13 +331,11 @@ async def get_enrichment_status():
     except Exception as e:
         logger.error(f"Failed to get enrichment status: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        db.close()
 
 
 # ============== DETAIL SCRAPING ENDPOINTS ==============
 
-@app.post("/workflows/detail-scrape/trigger", response_model=WorkflowResponse)
+@app.post("/workflows/detail-scrape/trigger", responses=_WORKFLOW_STARTED_DOC)
 async def trigger_detail_scrape_workflow(request: DetailScrapeRequest = DetailScrapeRequest()):
     """
     Trigger the detail scraping workflow to scrape full job details from posting URLs.
@@ -269,16 +357,14 @@ async def trigger_detail_scrape_workflow(request: DetailScrapeRequest = DetailSc
         max_concurrent_per_chunk: Concurrent scrapes within each chunk (default: 5)
     """
     try:
-        logger.info(f"Connecting to Temporal at {TEMPORAL_ADDRESS}")
-        client = await Client.connect(TEMPORAL_ADDRESS)
-        logger.info("Connected to Temporal successfully")
+        client = await get_temporal_client()
 
-        workflow_id = f"detail-scrape-{datetime.now(timezone.utc).strftime('%Y%m%d-%H%M%S')}-{str(uuid.uuid4())[:8]}"
+        workflow_id = _new_workflow_id("detail-scrape")
         logger.info(f"Starting detail scrape coordinator workflow with ID: {workflow_id}")
         logger.info(f"Config: chunk_size={request.chunk_size}, max_concurrent_chunks={request.max_concurrent_chunks}, max_concurrent_per_chunk={request.max_concurrent_per_chunk}")
 
         handle = await client.start_workflow(
-            DetailScrapeWorkflow.run,
+            DETAIL_SCRAPE_WORKFLOW,
             id=workflow_id,
             task_queue=TEMPORAL_TASK_QUEUE,
             args=[request.chunk_size, request.max_concurrent_chunks, request.max_concurrent_per_chunk]
@@ -287,11 +373,7 @@ async def trigger_detail_scrape_workflow(request: DetailScrapeRequest = DetailSc
         logger.info(f"Detail scrape workflow started: {workflow_id}")
         logger.info(f"View workflow in Temporal UI: http://localhost:8233/namespaces/default/workflows/{handle.id}")
 
-        return WorkflowResponse(
-            workflow_id=handle.id,
-            run_id=handle.result_run_id,
-            status="started"
-        )
+        return _workflow_started(handle.id, handle.result_run_id)
     except Exception as e:
         logger.error(f"Failed to start detail scrape workflow: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
@@ -303,27 +385,30 @@ async def get_detail_scrape_status():
     Get current detail scraping pipeline status.
     Returns counts of jobs in each stage of the pipeline.
     """
-    db = SessionLocal()
     try:
-        total_raw = db.query(JobListing).count()
-        total_golden = db.query(JobListingGolden).count()
-
-        detail_scraped = db.query(JobListingGolden).filter(
-            JobListingGolden.detail_scrape_status == 'completed'
-        ).count()
-
-        detail_failed = db.query(JobListingGolden).filter(
-            JobListingGolden.detail_scrape_status == 'failed'
-        ).count()
-
-        pending_enrichment = db.query(JobListingGolden).filter(
-            JobListingGolden.detail_scrape_status == 'completed',
-            JobListingGolden.enrichment_status == 'pending'
-        ).count()
-
-        enriched = db.query(JobListingGolden).filter(
-            JobListingGolden.enrichment_status == 'completed'
-        ).count()
+        async with AsyncSessionLocal() as db:
+            # All pipeline counts in one statement with conditional aggregation -
+            # the golden table is scanned once instead of five times
+            (
+                total_raw,
+                total_golden,
+                detail_scraped,
+                detail_failed,
+                pending_enrichment,
+                enriched,
+            ) = (await db.execute(
+                select(
+                    select(func.count()).select_from(JobListing).scalar_subquery(),
+                    func.count(),
+                    func.count().filter(JobListingGolden.detail_scrape_status == 'completed'),
+                    func.count().filter(JobListingGolden.detail_scrape_status == 'failed'),
+                    func.count().filter(
+                        JobListingGolden.detail_scrape_status == 'completed',
+                        JobListingGolden.enrichment_status == 'pending'
+                    ),
+                    func.count().filter(JobListingGolden.enrichment_status == 'completed'),
+                ).select_from(JobListingGolden)
+            )).one()
 
         not_yet_processed = total_raw - total_golden
 
@@ -351,59 +436,192 @@ async def get_detail_scrape_status():
     except Exception as e:
         logger.error(f"Failed to get detail scrape status: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        db.close()
+
+
+async def _fetch_workflow_status(workflow_id: str) -> Tuple[WorkflowStatusResponse, bool]:
+    """
+    Describe a workflow in Temporal (and fetch its result if completed).
+    Also returns whether the response is final: terminal, and for a completed
+    workflow the result was actually fetched.
+    """
+    logger.info(f"Fetching status for workflow: {workflow_id}")
+    client = await get_temporal_client()
+
+    # Get workflow handle
+    handle = client.get_workflow_handle(workflow_id)
+
+    # Request the result speculatively alongside describe() - completed
+    # workflows (the common polling case) then cost one round-trip, not two.
+    # For anything else the result long-poll is cancelled.
+    result_task = asyncio.create_task(handle.result())
+    # Failed workflows raise from result() - mark the exception as retrieved
+    result_task.add_done_callback(lambda t: t.cancelled() or t.exception())
+
+    try:
+        description = await handle.describe()
+    except BaseException:
+        result_task.cancel()
+        raise
+    logger.info(f"Workflow {workflow_id} status: {description.status.name}")
+
+    status = WORKFLOW_STATUS_MAP.get(description.status.name, "unknown")
+
+    result = None
+    final = status in TERMINAL_WORKFLOW_STATUSES
+    if status != "completed":
+        result_task.cancel()
+    else:
+        try:
+            result = await result_task
+            logger.info(f"Workflow {workflow_id} result: {result}")
+        except Exception as e:
+            logger.warning(f"Could not get result for workflow {workflow_id}: {str(e)}")
+            # Don't pin a null result forever - retry after the TTL
+            final = False
+
+    return WorkflowStatusResponse(
+        workflow_id=workflow_id,
+        run_id=description.run_id,
+        status=status,
+        result=result
+    ), final
+
+
+def _get_cached_status(workflow_id: str) -> Optional[WorkflowStatusResponse]:
+    """Return a cached status if it is final or still within the TTL"""
+    entry = _status_cache.get(workflow_id)
+    if entry is None:
+        return None
+    cached_at, response, final = entry
+    if final:
+        return response
+    if time.monotonic() - cached_at < STATUS_CACHE_TTL_SECONDS:
+        return response
+    return None
+
+
+def _cache_status(workflow_id: str, response: WorkflowStatusResponse, final: bool) -> None:
+    """Store a status in the cache, evicting the oldest entry when full"""
+    _status_cache.pop(workflow_id, None)
+    if len(_status_cache) >= STATUS_CACHE_MAX_ENTRIES:
+        _status_cache.pop(next(iter(_status_cache)))
+    _status_cache[workflow_id] = (time.monotonic(), response, final)
+
+
+async def _fetch_and_cache_status(workflow_id: str) -> WorkflowStatusResponse:
+    """Single-flight body: fetch once, cache once, for every waiter"""
+    response, final = await _fetch_workflow_status(workflow_id)
+    _cache_status(workflow_id, response, final)
+    return response
+
+
+def _get_inflight_status(workflow_id: str) -> "asyncio.Task[WorkflowStatusResponse]":
+    """
+    Join the in-flight fetch for a workflow, or start one.
+    No lock needed - the check-and-insert below never yields to the loop.
+    """
+    task = _status_inflight.get(workflow_id)
+    if task is None:
+        task = asyncio.create_task(_fetch_and_cache_status(workflow_id))
+        _status_inflight[workflow_id] = task
+
+        def _forget(done: "asyncio.Task[WorkflowStatusResponse]") -> None:
+            # Only drop our own entry - never a newer fetch for the same ID
+            if _status_inflight.get(workflow_id) is done:
+                del _status_inflight[workflow_id]
+
+        task.add_done_callback(_forget)
+    return task
 
 
 @app.get("/workflows/{workflow_id}", response_model=WorkflowStatusResponse)
 async def get_workflow_status(workflow_id: str):
     """
     Get the status of a running workflow
+
+    Terminal statuses are cached indefinitely and running ones for
+    STATUS_CACHE_TTL_SECONDS. Concurrent requests for the same workflow
+    share a single in-flight describe() call.
     """
+    cached = _get_cached_status(workflow_id)
+    if cached is not None:
+        return cached
+
     try:
-        logger.info(f"Fetching status for workflow: {workflow_id}")
-        client = await Client.connect(TEMPORAL_ADDRESS)
+        # Shield so one cancelled client doesn't cancel the shared fetch
+        return await asyncio.shield(_get_inflight_status(workflow_id))
+    except Exception as e:
+        logger.error(f"Failed to get workflow status for {workflow_id}: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Failed to get workflow status: {str(e)}")
 
-        # Get workflow handle
-        handle = client.get_workflow_handle(workflow_id)
 
-        # Describe the workflow to get its status
-        description = await handle.describe()
-        logger.info(f"Workflow {workflow_id} status: {description.status.name}")
-
-        # Map Temporal workflow status to our status
-        status_map = {
-            "RUNNING": "running",
-            "COMPLETED": "completed",
-            "FAILED": "failed",
-            "CANCELED": "canceled",
-            "TERMINATED": "terminated",
-            "CONTINUED_AS_NEW": "running",
-            "TIMED_OUT": "timed_out"
-        }
+@app.post("/workflows/status", response_model=List[WorkflowStatusResponse])
+async def get_workflow_statuses(request: WorkflowStatusBatchRequest):
+    """
+    Get the status of many workflows with a single Temporal visibility query.
 
-        status = status_map.get(description.status.name, "unknown")
-
-        # Try to get the result if workflow is completed
-        result = None
-        if status == "completed":
-            try:
-                result = await handle.result()
-                logger.info(f"Workflow {workflow_id} result: {result}")
-            except Exception as e:
-                logger.warning(f"Could not get result for workflow {workflow_id}: {str(e)}")
-
-        return WorkflowStatusResponse(
-            workflow_id=workflow_id,
-            run_id=description.run_id,
-            status=status,
-            result=result
+    Replaces N describe() round-trips with one ListWorkflowExecutions call.
+    IDs with a fresh entry in the status cache are served from it and left
+    out of the query. Results are only included for those cached entries -
+    use GET /workflows/{workflow_id} to fetch them.
+    Unknown IDs are returned with status "not_found".
+    """
+    if not request.ids:
+        return []
+
+    if any("'" in workflow_id for workflow_id in request.ids):
+        raise HTTPException(status_code=400, detail="Workflow IDs must not contain quotes")
+
+    cached = {}
+    for workflow_id in request.ids:
+        response = _get_cached_status(workflow_id)
+        if response is not None:
+            cached[workflow_id] = response
+
+    uncached_ids = [workflow_id for workflow_id in request.ids if workflow_id not in cached]
+
+    try:
+        # Visibility returns the most recent run first; keep only that one per ID
+        executions = {}
+        if uncached_ids:
+            client = await get_temporal_client()
+            query = "WorkflowId IN (" + ",".join(f"'{workflow_id}'" for workflow_id in uncached_ids) + ")"
+            async for execution in client.list_workflows(query=query):
+                if execution.id not in executions:
+                    executions[execution.id] = execution
+
+        statuses = []
+        for workflow_id in request.ids:
+            if workflow_id in cached:
+                statuses.append(cached[workflow_id])
+                continue
+
+            execution = executions.get(workflow_id)
+            if execution is None:
+                statuses.append(WorkflowStatusResponse(
+                    workflow_id=workflow_id,
+                    run_id="",
+                    status="not_found"
+                ))
+                continue
+
+            status_name = execution.status.name if execution.status else None
+            statuses.append(WorkflowStatusResponse(
+                workflow_id=workflow_id,
+                run_id=execution.run_id,
+                status=WORKFLOW_STATUS_MAP.get(status_name, "unknown")
+            ))
+
+        logger.info(
+            f"Fetched status for {len(executions)}/{len(uncached_ids)} workflows "
+            f"({len(cached)} served from cache)"
         )
+        return statuses
     except Exception as e:
-        logger.error(f"Failed to get workflow status for {workflow_id}: {str(e)}", exc_info=True)
-        raise HTTPException(status_code=500, detail=f"Failed to get workflow status: {str(e)}")
+        logger.error(f"Failed to get workflow statuses: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Failed to get workflow statuses: {str(e)}")
 
 if __name__ == "__main__":
     import uvicorn
     port = int(os.getenv("PORT", 8000))
-    uvicorn.run(app, host="0.0.0.0", port=port)
+    uvicorn.run(app, host="0.0.0.0", port=port, loop="uvloop")
@@ -1,15 +1,39 @@
 """
 Constants used across the workflow service
+
+Every value can be overridden with an environment variable of the same name,
+so throughput knobs can be tuned per deployment without a code change.
 """
+import os
 
 # Scraping configuration
-MAX_PAGES = 500  # Maximum number of pages to scrape per scraper
-CONCURRENT_PAGES_PER_SCRAPER = 10  # Max concurrent page requests to avoid DDoS detection
-BATCH_DELAY_SECONDS = 10  # Delay between batches to be respectful to servers
+MAX_PAGES = int(os.getenv("MAX_PAGES", "500"))  # Maximum number of pages to scrape per scraper
+CONCURRENT_PAGES_PER_SCRAPER = int(os.getenv("CONCURRENT_PAGES_PER_SCRAPER", "10"))  # Max concurrent page requests to avoid DDoS detection
+BATCH_DELAY_SECONDS = int(os.getenv("BATCH_DELAY_SECONDS", "10"))  # Delay between batches to be respectful to servers
 
 # Enrichment pipeline configuration
-ENRICHMENT_BATCH_SIZE = 20  # Number of jobs to process per batch
-ENRICHMENT_BATCH_TIMEOUT = 3.0  # Seconds to wait for batch collection
-PUPPETEER_RATE_LIMIT = 2  # Max concurrent Puppeteer scraping sessions
-OLLAMA_RATE_LIMIT = 10  # Max concurrent Ollama API calls
-ENRICHMENT_MAX_RETRIES = 3  # Max retries before sending to DLQ
+ENRICHMENT_BATCH_SIZE = int(os.getenv("ENRICHMENT_BATCH_SIZE", "20"))  # Number of jobs to process per batch
+ENRICHMENT_BATCH_TIMEOUT = float(os.getenv("ENRICHMENT_BATCH_TIMEOUT", "3.0"))  # Seconds to wait for batch collection
+PUPPETEER_RATE_LIMIT = int(os.getenv("PUPPETEER_RATE_LIMIT", "2"))  # Max concurrent Puppeteer scraping sessions
+OLLAMA_RATE_LIMIT = int(os.getenv("OLLAMA_RATE_LIMIT", "10"))  # Max concurrent Ollama API calls
+ENRICHMENT_MAX_RETRIES = int(os.getenv("ENRICHMENT_MAX_RETRIES", "3"))  # Max retries before sending to DLQ
+ENRICHMENT_PREFETCH_MULTIPLIER = int(os.getenv("ENRICHMENT_PREFETCH_MULTIPLIER", "4"))  # Batches in flight from the broker
+ENRICHMENT_BATCH_MAX_BYTES = int(os.getenv("ENRICHMENT_BATCH_MAX_BYTES", str(8 * 1024 * 1024)))  # Flush once payloads reach this size
+ENRICHMENT_BATCH_LINGER = float(os.getenv("ENRICHMENT_BATCH_LINGER", "0.05"))  # Seconds a partial batch waits for more messages
+
+# Job listing consumer configuration
+CONSUMER_BATCH_SIZE = int(os.getenv("CONSUMER_BATCH_SIZE", "500"))  # Messages per DB insert batch
+CONSUMER_BATCH_TIMEOUT = float(os.getenv("CONSUMER_BATCH_TIMEOUT", "2.0"))  # Seconds to wait for a batch to fill
+# Batches in flight from the broker. PREFETCH_MULTIPLIER is the name this used
+# to be read from - still honoured as a fallback so existing deployments keep it
+CONSUMER_PREFETCH_MULTIPLIER = int(os.getenv("CONSUMER_PREFETCH_MULTIPLIER", os.getenv("PREFETCH_MULTIPLIER", "4")))
+CONSUMER_MAX_RETRIES = int(os.getenv("CONSUMER_MAX_RETRIES", "3"))  # Max retries before sending to DLQ
+
+# Golden job consumer configuration
+GOLDEN_BATCH_SIZE = int(os.getenv("GOLDEN_BATCH_SIZE", "500"))  # Enriched jobs per DB batch
+GOLDEN_BATCH_TIMEOUT = float(os.getenv("GOLDEN_BATCH_TIMEOUT", "0.5"))  # Seconds to wait for a batch to fill
+GOLDEN_PREFETCH_MULTIPLIER = int(os.getenv("GOLDEN_PREFETCH_MULTIPLIER", "3"))  # Batches in flight from the broker
+GOLDEN_DB_CONCURRENCY = int(os.getenv("GOLDEN_DB_CONCURRENCY", "8"))  # Parallel per-row transactions on bulk fallback
+
+# Logging
+ERROR_TRACEBACK_SAMPLE_RATE = int(os.getenv("ERROR_TRACEBACK_SAMPLE_RATE", "100"))  # Log a traceback for 1 in N per-message failures
@@ -2,38 +2,57 @@
 RabbitMQ consumer for processing scraped job listings and writing to database
 """
 import asyncio
-import json
 import logging
 import os
 import signal
-from typing import List, Dict, Any
+import orjson
+import uvloop
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime, timezone
 
 from aio_pika import connect_robust, IncomingMessage
 from aio_pika.abc import AbstractIncomingMessage
+from sqlalchemy import text
 from sqlalchemy.orm import Session
-from sqlalchemy.exc import IntegrityError
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 
+from const import (
+    CONSUMER_BATCH_SIZE,
+    CONSUMER_BATCH_TIMEOUT,
+    CONSUMER_PREFETCH_MULTIPLIER,
+    CONSUMER_MAX_RETRIES,
+)
 from database import SessionLocal
+from db import JOB_LISTING_COLUMNS, get_pool, close_pool, bulk_upsert_job_listings, job_listing_record
 from models.job_listing import JobListing
+from logging_config import configure_logging
 from queue_config import (
     RABBITMQ_URL,
     JOBS_QUEUE,
     JOBS_DLQ,
     setup_queues,
+    ack_contiguous,
 )
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+# Configure logging - records are written by a background thread, so the
+# event loop never blocks on stderr
+configure_logging()
 logger = logging.getLogger(__name__)
 
 # Batch configuration
-BATCH_SIZE = 50  # Process up to 50 messages in a batch
-BATCH_TIMEOUT = 2.0  # Wait up to 2 seconds to collect a batch
-MAX_RETRIES = 3  # Maximum number of retries before sending to DLQ
+# Unacked deliveries the broker may push ahead - lets the next batches buffer
+# while the current one is being written, without unbounded memory if the DB stalls
+PREFETCH_COUNT = CONSUMER_BATCH_SIZE * CONSUMER_PREFETCH_MULTIPLIER
+
+# Records are tuples ordered like JOB_LISTING_COLUMNS - no dict per message
+_POSTING_URL = JOB_LISTING_COLUMNS.index("posting_url")
+
+
+# Core INSERT against the bare table for the per-row fallback - skips ORM
+# object construction and instrumentation. Duplicates on posting_url or
+# uq_job_listing_details are skipped by the database.
+_job_listings = JobListing.__table__
+_INSERT_JOB_LISTING = pg_insert(_job_listings).on_conflict_do_nothing()
 
 
 class JobListingConsumer:
@@ -43,20 +62,47 @@ class JobListingConsumer:
 
     def __init__(self):
         self.running = False
-        self.message_batch: List[AbstractIncomingMessage] = []
-        self.batch_lock = asyncio.Lock()
-        self.batch_event = asyncio.Event()
+        # One session for the consumer's lifetime, opened in start()
+        self.db: Optional[Session] = None
+        # Hand-off between the delivery callback and batch_processor; sized to
+        # the prefetch window so put() never blocks a delivery
+        self.queue: asyncio.Queue[AbstractIncomingMessage] = asyncio.Queue(maxsize=PREFETCH_COUNT)
 
     async def process_message(self, message: IncomingMessage) -> None:
         """
         Add message to batch for processing
         """
-        async with self.batch_lock:
-            self.message_batch.append(message)
+        await self.queue.put(message)
+
+    async def _collect_batch(self) -> List[AbstractIncomingMessage]:
+        """
+        Wait for a first message, then drain until the batch is full or
+        CONSUMER_BATCH_TIMEOUT has passed since it arrived. Returns [] on idle timeout.
+        """
+        try:
+            batch = [await asyncio.wait_for(self.queue.get(), timeout=CONSUMER_BATCH_TIMEOUT)]
+        except asyncio.TimeoutError:
+            return []
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + CONSUMER_BATCH_TIMEOUT
 
-            # If batch is full, trigger processing
-            if len(self.message_batch) >= BATCH_SIZE:
-                self.batch_event.set()
+        while len(batch) < CONSUMER_BATCH_SIZE:
+            try:
+                batch.append(self.queue.get_nowait())
+                continue
+            except asyncio.QueueEmpty:
+                pass
+
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self.queue.get(), timeout=remaining))
+            except asyncio.TimeoutError:
+                break
+
+        return batch
 
     async def batch_processor(self) -> None:
         """
@@ -64,23 +110,9 @@ class JobListingConsumer:
         """
         while self.running:
             try:
-                # Wait for batch to fill or timeout
-                try:
-                    await asyncio.wait_for(
-                        self.batch_event.wait(),
-                        timeout=BATCH_TIMEOUT
-                    )
-                except asyncio.TimeoutError:
-                    pass  # Timeout is expected
-
-                # Get the batch
-                async with self.batch_lock:
-                    if not self.message_batch:
-                        continue
-
-                    batch = self.message_batch.copy()
-                    self.message_batch.clear()
-                    self.batch_event.clear()
+                batch = await self._collect_batch()
+                if not batch:
+                    continue
 
                 # Process the batch
                 await self._process_batch(batch)
@@ -98,88 +130,66 @@ class JobListingConsumer:
 
         logger.info(f"Processing batch of {len(messages)} messages")
 
-        db: Session = SessionLocal()
-        jobs_to_insert: List[JobListing] = []
-        message_job_mapping: Dict[int, AbstractIncomingMessage] = {}
+        db = self.db
+        records: List[Tuple[Any, ...]] = []
+        parsed_messages: List[AbstractIncomingMessage] = []
+        # posting_url -> index into records, for in-batch dedup (last occurrence wins)
+        seen_urls: Dict[str, int] = {}
+        batch_duplicates: List[AbstractIncomingMessage] = []
+        now = datetime.now(timezone.utc)
 
         try:
-            # Parse all messages and prepare job listings
-            for idx, message in enumerate(messages):
+            # Parse all messages and prepare job listing records
+            for message in messages:
                 try:
-                    job_data = json.loads(message.body.decode())
-
-                    # Create job listing object
-                    job_listing = JobListing(
-                        company_title=job_data.get("companyTitle", ""),
-                        job_role=job_data.get("jobRole", ""),
-                        job_location=job_data.get("jobLocation"),
-                        employment_type=job_data.get("employmentType"),
-                        salary_range=job_data.get("salaryRange"),
-                        min_salary=job_data.get("minSalary"),
-                        max_salary=job_data.get("maxSalary"),
-                        required_experience=job_data.get("requiredExperience"),
-                        seniority_level=job_data.get("seniorityLevel"),
-                        job_description=job_data.get("jobDescription"),
-                        date_posted=job_data.get("datePosted"),
-                        posting_url=job_data.get("postingUrl"),
-                        hiring_team=job_data.get("hiringTeam"),
-                        about_company=job_data.get("aboutCompany"),
-                        scraper_source=job_data.get("scraper_source"),
-                        scraped_at=datetime.now(timezone.utc)
-                    )
-
-                    jobs_to_insert.append(job_listing)
-                    message_job_mapping[idx] = message
+                    job_data = orjson.loads(message.body)
+                    record = job_listing_record(job_data, job_data.get("scraper_source"), now)
+
+                    posting_url = record[_POSTING_URL]
+                    if posting_url is not None and posting_url in seen_urls:
+                        # Same job twice in one batch - keep the newer copy
+                        idx = seen_urls[posting_url]
+                        batch_duplicates.append(parsed_messages[idx])
+                        records[idx] = record
+                        parsed_messages[idx] = message
+                        continue
+
+                    if posting_url is not None:
+                        seen_urls[posting_url] = len(records)
+                    records.append(record)
+                    parsed_messages.append(message)
 
                 except Exception as e:
                     logger.error(f"Failed to parse message: {str(e)}")
                     # Reject malformed message
                     await message.reject(requeue=False)
 
-            # Bulk insert all jobs
-            if jobs_to_insert:
-                inserted_count = 0
-                duplicate_count = 0
-                failed_messages = []
-
-                # Insert jobs one by one to handle duplicates gracefully
-                for idx, job in enumerate(jobs_to_insert):
-                    message = message_job_mapping[idx]
+            if batch_duplicates:
+                # Superseded copies never reach the DB - they're acked with the batch
+                logger.info(f"Skipping {len(batch_duplicates)} duplicate jobs within batch")
 
-                    try:
-                        db.add(job)
-                        db.flush()
-                        inserted_count += 1
+            if not records:
+                return
 
-                        # Acknowledge successful insert
-                        await message.ack()
-
-                    except IntegrityError:
-                        # Duplicate job listing
-                        db.rollback()
-                        duplicate_count += 1
-
-                        # Acknowledge duplicate (no need to reprocess)
-                        await message.ack()
-                        logger.debug(f"Duplicate job skipped: {job.posting_url}")
-
-                    except Exception as e:
-                        db.rollback()
-                        logger.error(f"Failed to insert job: {str(e)}")
-                        failed_messages.append((message, job))
-
-                # Commit successful inserts
-                db.commit()
+            # COPY into staging + one INSERT ... ON CONFLICT DO NOTHING, on the
+            # asyncpg pool so the event loop isn't blocked while it runs
+            try:
+                pool = await get_pool()
+                async with pool.acquire() as conn:
+                    inserted_count = await bulk_upsert_job_listings(conn, records)
+            except Exception as e:
+                logger.warning(f"Bulk insert failed, falling back to per-row inserts: {str(e)}")
+                await ack_contiguous(messages, batch_duplicates)
+                await self._insert_rows_individually(db, records, parsed_messages)
+                return
 
-                logger.info(
-                    f"Batch processed: {inserted_count} inserted, "
-                    f"{duplicate_count} duplicates skipped, "
-                    f"{len(failed_messages)} failed"
-                )
+            # Everything was either inserted or a duplicate - ack the whole batch at once
+            await ack_contiguous(messages, parsed_messages + batch_duplicates)
 
-                # Handle failed messages
-                for message, job in failed_messages:
-                    await self._handle_failed_message(message, job)
+            logger.info(
+                f"Batch processed: {inserted_count} inserted, "
+                f"{len(records) - inserted_count} duplicates skipped, 0 failed"
+            )
 
         except Exception as e:
             db.rollback()
@@ -189,13 +199,69 @@ class JobListingConsumer:
             for message in messages:
                 await self._handle_failed_message(message, None)
 
-        finally:
-            db.close()
+    def _insert_rows_sync(self, db: Session, records: List[Tuple[Any, ...]]) -> List[Optional[bool]]:
+        """
+        Insert records one by one and commit (runs in a worker thread).
+        Returns per record: True if inserted, False if it was a duplicate,
+        None if the insert failed.
+        """
+        statuses: List[Optional[bool]] = []
+        for record in records:
+            try:
+                # Savepoint per row so a bad row doesn't roll back earlier inserts
+                with db.begin_nested():
+                    result = db.execute(_INSERT_JOB_LISTING, dict(zip(JOB_LISTING_COLUMNS, record)))
+                statuses.append(bool(result.rowcount))
+            except Exception as e:
+                logger.error(f"Failed to insert job: {str(e)}")
+                statuses.append(None)
+
+        db.commit()
+        return statuses
+
+    async def _insert_rows_individually(
+        self,
+        db: Session,
+        records: List[Tuple[Any, ...]],
+        messages: List[AbstractIncomingMessage]
+    ) -> None:
+        """
+        Slow path: insert rows one by one so a single bad row can't fail the batch.
+        The blocking inserts run in a worker thread so deliveries keep flowing.
+        """
+        acked_messages: List[AbstractIncomingMessage] = []
+        duplicate_messages: List[AbstractIncomingMessage] = []
+        failed_messages = []
+
+        statuses = await asyncio.to_thread(self._insert_rows_sync, db, records)
+
+        for record, message, status in zip(records, messages, statuses):
+            if status is None:
+                failed_messages.append((message, record[_POSTING_URL]))
+            elif status:
+                acked_messages.append(message)
+            else:
+                # Duplicate job listing - ack as well, no need to reprocess
+                duplicate_messages.append(message)
+                logger.debug(f"Duplicate job skipped: {record[_POSTING_URL]}")
+
+        # Inserts are committed - settle the failures, then ack everything
+        # else - with the failures settled that's a single multiple=True frame
+        await asyncio.gather(
+            *(self._handle_failed_message(message, posting_url) for message, posting_url in failed_messages)
+        )
+        await ack_contiguous(messages, acked_messages + duplicate_messages)
+
+        logger.info(
+            f"Batch processed: {len(acked_messages)} inserted, "
+            f"{len(duplicate_messages)} duplicates skipped, "
+            f"{len(failed_messages)} failed"
+        )
 
     async def _handle_failed_message(
         self,
         message: AbstractIncomingMessage,
-        job: JobListing = None
+        posting_url: Optional[str] = None
     ) -> None:
         """
         Handle a failed message with retry logic
@@ -205,12 +271,12 @@ class JobListingConsumer:
         if message.headers and "x-retry-count" in message.headers:
             retry_count = int(message.headers["x-retry-count"])
 
-        if retry_count < MAX_RETRIES:
+        if retry_count < CONSUMER_MAX_RETRIES:
             # Increment retry count and requeue
             retry_count += 1
             logger.warning(
-                f"Requeuing message (attempt {retry_count}/{MAX_RETRIES}): "
-                f"{job.posting_url if job else 'unknown'}"
+                f"Requeuing message (attempt {retry_count}/{CONSUMER_MAX_RETRIES}): "
+                f"{posting_url or 'unknown'}"
             )
 
             # Reject and requeue with updated retry count
@@ -219,7 +285,7 @@ class JobListingConsumer:
             # Max retries exceeded, send to DLQ
             logger.error(
                 f"Max retries exceeded, sending to DLQ: "
-                f"{job.posting_url if job else 'unknown'}"
+                f"{posting_url or 'unknown'}"
             )
             # Reject without requeue (will go to DLQ if configured)
             await message.reject(requeue=False)
@@ -250,9 +316,17 @@ class JobListingConsumer:
                 logger.warning(f"Failed to connect to RabbitMQ: {str(e)}. Retrying in {wait_time}s...")
                 await asyncio.sleep(wait_time)
 
+        # Open the long-lived session and warm its pooled connection
+        self.db = SessionLocal()
+        self.db.execute(text("SELECT 1"))
+        self.db.commit()
+        logger.info("Database session ready")
+
         # Setup channel
-        channel = await connection.channel()
-        await channel.set_qos(prefetch_count=BATCH_SIZE * 2)
+        # Consume-only channel: no publisher confirms to negotiate or track;
+        # acks go out as batched multiple=True frames (ack_contiguous)
+        channel = await connection.channel(publisher_confirms=False)
+        await channel.set_qos(prefetch_count=PREFETCH_COUNT, global_=False)
 
         # Setup queues and exchanges
         await setup_queues()
@@ -265,7 +339,7 @@ class JobListingConsumer:
         batch_task = asyncio.create_task(self.batch_processor())
 
         logger.info(f"Consumer started, listening on queue: {JOBS_QUEUE}")
-        logger.info(f"Batch size: {BATCH_SIZE}, Batch timeout: {BATCH_TIMEOUT}s")
+        logger.info(f"Batch size: {CONSUMER_BATCH_SIZE}, Batch timeout: {CONSUMER_BATCH_TIMEOUT}s, Prefetch: {PREFETCH_COUNT}")
 
         # Start consuming
         await queue.consume(self.process_message)
@@ -278,6 +352,8 @@ class JobListingConsumer:
             # Cleanup
             batch_task.cancel()
             await connection.close()
+            await close_pool()
+            self.db.close()
             logger.info("Consumer stopped")
 
     def stop(self) -> None:
@@ -304,6 +380,11 @@ async def main():
     """
     Main entry point
     """
+    # Run new tasks eagerly until their first await (Python 3.12+) - many
+    # ack/reject coroutines finish without ever suspending
+    if hasattr(asyncio, "eager_task_factory"):
+        asyncio.get_running_loop().set_task_factory(asyncio.eager_task_factory)
+
     # Register signal handlers
     signal.signal(signal.SIGINT, signal_handler)
     signal.signal(signal.SIGTERM, signal_handler)
@@ -316,4 +397,5 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    # libuv-backed event loop - lower per-callback overhead on the ack/commit path
+    uvloop.run(main())
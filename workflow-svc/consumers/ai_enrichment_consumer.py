@@ -5,37 +5,60 @@ Performs deep scraping + AI enrichment
 Publishes to enriched_jobs queue
 """
 import asyncio
-import json
 import logging
 import os
 import signal
 import sys
+import time
+import msgpack
+import orjson
+import uvloop
 from datetime import datetime, timezone
-from typing import List
+from typing import List, Optional
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from aio_pika import connect_robust, Message, DeliveryMode
-from aio_pika.abc import AbstractIncomingMessage
+from aio_pika.abc import AbstractIncomingMessage, AbstractRobustConnection, AbstractChannel, AbstractExchange
 
+from logging_config import configure_logging
 from queue_config import (
     RABBITMQ_URL, RAW_JOBS_QUEUE, ENRICHED_JOBS_QUEUE,
-    ENRICHED_JOBS_EXCHANGE, RAW_JOBS_DLQ
+    ENRICHED_JOBS_EXCHANGE, RAW_JOBS_DLQ, ENRICHED_JOBS_CONTENT_TYPE,
+    ack_contiguous, requeue_with_retry_count
 )
 from const import (
     ENRICHMENT_BATCH_SIZE, ENRICHMENT_BATCH_TIMEOUT,
-    OLLAMA_RATE_LIMIT, ENRICHMENT_MAX_RETRIES
+    OLLAMA_RATE_LIMIT, ENRICHMENT_MAX_RETRIES, ENRICHMENT_PREFETCH_MULTIPLIER,
+    ENRICHMENT_BATCH_MAX_BYTES, ENRICHMENT_BATCH_LINGER, ERROR_TRACEBACK_SAMPLE_RATE
 )
 from services.ollama_client import OllamaClient
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+# Configure logging - records are written by a background thread, so the
+# event loop never blocks on stderr
+configure_logging()
 logger = logging.getLogger(__name__)
 
+# One packer for the process: packb() builds a Packer (and its buffer) per call,
+# while pack() reuses the internal buffer. Publishes all run on the event loop.
+_packer = msgpack.Packer(use_bin_type=True, datetime=True)
+
+
+def _make_enriched_message(data: dict) -> Message:
+    """Build the enriched_jobs message for one job"""
+    # msgpack: smaller frames than JSON and no text parsing on the golden side
+    return Message(
+        body=_packer.pack(data),
+        delivery_mode=DeliveryMode.PERSISTENT,
+        content_type=ENRICHED_JOBS_CONTENT_TYPE,
+        headers={
+            "source_job_id": data.get('id'),
+            "posting_url": data['posting_url'],
+            "enrichment_status": data.get('enrichment_status')
+        }
+    )
+
 
 class AIEnrichmentConsumer:
     """
@@ -45,25 +68,42 @@ class AIEnrichmentConsumer:
     def __init__(self):
         self.ollama_client = OllamaClient()
         self.running = False
+        # No lock: appends and the swap in batch_processor never await, so
+        # they can't interleave on the single-threaded event loop
         self.message_batch: List[AbstractIncomingMessage] = []
-        self.batch_lock = asyncio.Lock()
+        self.batch_bytes = 0
         self.batch_event = asyncio.Event()
+        # Per-message failures seen, for sampling tracebacks
+        self.error_count = 0
 
-        # Rate limiter for Ollama (no need for puppeteer - data already scraped)
-        self.ollama_semaphore = asyncio.Semaphore(OLLAMA_RATE_LIMIT)
+        # Long-lived publisher connection, separate from the consuming one so
+        # publish flow control can't stall deliveries
+        self._pub_conn: Optional[AbstractRobustConnection] = None
+        self._pub_channel: Optional[AbstractChannel] = None
+        self._pub_exchange: Optional[AbstractExchange] = None
+        self._pub_lock = asyncio.Lock()
 
     async def process_message(self, message: AbstractIncomingMessage):
         """Add message to batch"""
-        async with self.batch_lock:
-            self.message_batch.append(message)
-            if len(self.message_batch) >= ENRICHMENT_BATCH_SIZE:
-                self.batch_event.set()
+        self.message_batch.append(message)
+        self.batch_bytes += len(message.body)
+        # Wake the processor on the first message (it lingers briefly for more)
+        # and again once the batch is full by count or bytes
+        if len(self.message_batch) == 1 or self._batch_full():
+            self.batch_event.set()
+
+    def _batch_full(self) -> bool:
+        """Count threshold for throughput, byte threshold so a few huge pages don't stall a batch"""
+        return (
+            len(self.message_batch) >= ENRICHMENT_BATCH_SIZE
+            or self.batch_bytes >= ENRICHMENT_BATCH_MAX_BYTES
+        )
 
     async def batch_processor(self):
         """Process messages in batches"""
         while self.running:
             try:
-                # Wait for batch to fill or timeout
+                # Wait for the first message (or a full batch)
                 try:
                     await asyncio.wait_for(
                         self.batch_event.wait(),
@@ -71,185 +111,254 @@ class AIEnrichmentConsumer:
                     )
                 except asyncio.TimeoutError:
                     pass
-
-                # Get current batch
-                async with self.batch_lock:
-                    if not self.message_batch:
-                        self.batch_event.clear()
-                        continue
-
-                    batch = self.message_batch.copy()
-                    self.message_batch.clear()
-                    self.batch_event.clear()
+                self.batch_event.clear()
+
+                if not self.message_batch:
+                    continue
+
+                # Partial batch: linger briefly so a burst can fill it, rather
+                # than holding early jobs for the full batch timeout
+                if not self._batch_full():
+                    try:
+                        await asyncio.wait_for(
+                            self.batch_event.wait(),
+                            timeout=ENRICHMENT_BATCH_LINGER
+                        )
+                    except asyncio.TimeoutError:
+                        pass
+
+                # Take the current batch by swapping in a fresh list (no copy)
+                batch = self.message_batch
+                self.message_batch = []
+                self.batch_bytes = 0
+                self.batch_event.clear()
 
                 # Process batch
-                logger.info(f"[AI Consumer] ━━━ Processing batch of {len(batch)} jobs for enrichment ━━━")
-                batch_start = datetime.now(timezone.utc)
+                logger.debug("[AI Consumer] Processing batch of %d jobs for enrichment", len(batch))
                 await self._process_batch(batch)
-                batch_duration = (datetime.now(timezone.utc) - batch_start).total_seconds()
-                logger.info(f"[AI Consumer] ━━━ Batch completed in {batch_duration:.2f}s ━━━")
 
             except Exception as e:
-                logger.error(f"Error in batch processor: {str(e)}", exc_info=True)
+                logger.error("Error in batch processor: %s", e, exc_info=True)
 
     async def _process_batch(self, messages: List[AbstractIncomingMessage]):
         """
         Process batch of raw jobs:
-        1. Deep scrape job URLs
-        2. Enrich with Ollama AI
-        3. Publish to enriched_jobs queue
+        1. Enrich each job with Ollama AI (OLLAMA_RATE_LIMIT workers)
+        2. Publish each enriched job to enriched_jobs as soon as it is ready
+        3. Ack the source messages whose publish was confirmed
         """
-        enrichment_tasks = [
-            self._enrich_single_job(message)
-            for message in messages
+        batch_start_ns = time.monotonic_ns()
+        publishes: List[Optional[asyncio.Task]] = [None] * len(messages)
+        durations: List[int] = []
+        work: asyncio.Queue = asyncio.Queue()
+        for index, message in enumerate(messages):
+            work.put_nowait((index, message))
+
+        async def worker():
+            # Fixed pool instead of one task per job behind a semaphore - only
+            # OLLAMA_RATE_LIMIT enrichments (and their payloads) exist at once
+            while True:
+                try:
+                    index, message = work.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                final_data = await self._enrich_single_job(message)
+                if final_data is not None:
+                    durations.append(final_data['processing_duration_ms'])
+                    # Publish now rather than after the slowest job in the batch;
+                    # the worker moves on while the broker confirm is in flight
+                    publishes[index] = asyncio.create_task(
+                        self._publish_to_enriched_queue(final_data)
+                    )
+
+        await asyncio.gather(*(worker() for _ in range(min(OLLAMA_RATE_LIMIT, len(messages)))))
+
+        enriched = [
+            (message, publish)
+            for message, publish in zip(messages, publishes)
+            if publish is not None
         ]
+        enrich_failed = len(messages) - len(enriched)
+
+        published: List[AbstractIncomingMessage] = []
+        publish_failed = 0
+        if enriched:
+            publish_results = await asyncio.gather(
+                *(publish for _, publish in enriched),
+                return_exceptions=True
+            )
 
-        results = await asyncio.gather(*enrichment_tasks, return_exceptions=True)
+            for (message, _), publish_result in zip(enriched, publish_results):
+                if isinstance(publish_result, BaseException):
+                    publish_failed += 1
+                    await self._handle_failed_message(message, str(publish_result))
+                else:
+                    published.append(message)
 
-        # Log results
-        success_count = sum(1 for r in results if r is True)
-        failed_count = sum(1 for r in results if r is not True)
+            # Ack only what the broker confirmed - one frame per contiguous run;
+            # failures above are already settled, and batches run one at a time
+            await ack_contiguous(messages, published)
 
+        # One summary line per batch instead of several INFO lines per job
         logger.info(
-            f"Batch processing complete: {success_count} succeeded, "
-            f"{failed_count} failed"
+            "[AI Consumer] Batch of %d done in %.2fs: %d succeeded, %d failed; "
+            "per-job ms avg=%d min=%d max=%d",
+            len(messages),
+            (time.monotonic_ns() - batch_start_ns) / 1e9,
+            len(published),
+            enrich_failed + publish_failed,
+            sum(durations) // len(durations) if durations else 0,
+            min(durations, default=0),
+            max(durations, default=0)
         )
 
-    async def _enrich_single_job(self, message: AbstractIncomingMessage) -> bool:
+    async def _enrich_single_job(self, message: AbstractIncomingMessage) -> Optional[dict]:
         """
         Enrich a single job listing:
         1. Parse message to get job data (already contains full details from golden table)
         2. Call Ollama for AI enrichment (with rate limiting)
-        3. Publish enriched result
-        4. Ack/nack message
+        3. Return the enriched payload for the batch publish
+
+        On failure (including an Ollama call that raised) the message is
+        nacked/rejected here and None is returned. A response that came back
+        but couldn't be parsed is still published, as a 'partial' enrichment.
 
         Note: Jobs come from golden table with job_description_full and full_page_text
         already populated from detail scraping phase. No need to scrape again.
         """
         try:
-            start_time = datetime.now(timezone.utc)
-            job_data = json.loads(message.body.decode())
-
-            logger.info(
-                f"Enriching job: {job_data.get('company_title')} - "
-                f"{job_data.get('job_role')}"
-            )
+            # Monotonic clock for durations; wall clock only once, for enriched_at
+            start_ns = time.monotonic_ns()
+            job_data = orjson.loads(message.body)
+            posting_url = job_data['posting_url']
 
             # Debug: Log what data we have for enrichment
-            job_desc_len = len(job_data.get('job_description_full') or '')
-            full_text_len = len(job_data.get('full_page_text') or '')
-            logger.info(
-                f"[AI Consumer] Job data received - "
-                f"job_description_full: {job_desc_len} chars, "
-                f"full_page_text: {full_text_len} chars, "
-                f"location: {job_data.get('job_location_raw') or job_data.get('job_location')}, "
-                f"salary: {job_data.get('salary_range_raw') or job_data.get('salary_range')}"
-            )
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "[AI Consumer] Job data received for %s - %s - "
+                    "job_description_full: %d chars, full_page_text: %d chars, "
+                    "location: %s, salary: %s",
+                    job_data.get('company_title'),
+                    job_data.get('job_role'),
+                    len(job_data.get('job_description_full') or ''),
+                    len(job_data.get('full_page_text') or ''),
+                    job_data.get('job_location_raw') or job_data.get('job_location'),
+                    job_data.get('salary_range_raw') or job_data.get('salary_range')
+                )
 
             # Job data already contains full details from golden table (detail scraping phase)
             # No need to deep scrape again - just use the data we have
 
             # AI enrichment (with rate limiting) - use job_data directly from golden table
-            ai_enrichment = {}
-            ai_start = datetime.now(timezone.utc)
+            ai_start_ns = time.monotonic_ns()
             try:
-                logger.debug(f"[AI Consumer] Acquiring Ollama semaphore for {job_data['posting_url']}")
-                async with self.ollama_semaphore:
-                    logger.info(f"[AI Consumer] Starting AI enrichment for {job_data['posting_url']}")
-                    ai_enrichment = await self.ollama_client.enrich_job_listing(
-                        job_data  # Use job_data directly - already has full details from golden table
-                    )
-                    ai_duration = (datetime.now(timezone.utc) - ai_start).total_seconds()
-                    logger.info(f"[AI Consumer] AI enrichment completed in {ai_duration:.2f}s for {job_data['posting_url']}")
-            except Exception as e:
-                logger.error(
-                    f"[AI Consumer] AI enrichment failed for {job_data['posting_url']}: {str(e)}"
+                ai_enrichment = await self.ollama_client.enrich_job_listing(
+                    job_data  # Use job_data directly - already has full details from golden table
+                )
+                logger.debug(
+                    "[AI Consumer] AI enrichment completed in %.2fs for %s",
+                    (time.monotonic_ns() - ai_start_ns) / 1e9, posting_url
                 )
-                ai_enrichment = {"error": str(e)}
+            except Exception as e:
+                # Nothing useful to store - retry/DLQ here instead of publishing
+                # an error payload just for the golden consumer to write back
+                logger.error("[AI Consumer] AI enrichment failed for %s: %s", posting_url, e)
+                await self._handle_failed_message(message, str(e))
+                return None
 
             # Combine job data with AI enrichment results
             end_time = datetime.now(timezone.utc)
-            total_duration = int((end_time - start_time).total_seconds() * 1000)
+            total_duration = (time.monotonic_ns() - start_ns) // 1_000_000
             enrichment_status = 'completed' if 'error' not in ai_enrichment else 'partial'
 
             final_data = {
                 **job_data,  # Original data from golden table
                 'ai_enrichment': ai_enrichment,
-                'enriched_at': end_time.isoformat(),
+                'enriched_at': end_time,  # msgpack timestamp extension
                 'enrichment_status': enrichment_status,
                 'processing_duration_ms': total_duration
             }
 
             logger.info(
-                f"[AI Consumer] Combined enrichment data for {job_data['posting_url']}: "
-                f"status={enrichment_status}, total_duration={total_duration}ms"
+                "[AI Consumer] ✅ Enriched job: %s (status=%s, total: %dms)",
+                posting_url, enrichment_status, total_duration
             )
-
-            # Step 4: Publish to enriched_jobs queue
-            logger.debug(f"[AI Consumer] Publishing to enriched_jobs queue: {job_data['posting_url']}")
-            await self._publish_to_enriched_queue(final_data)
-            logger.info(f"[AI Consumer] Published to enriched_jobs queue: {job_data['posting_url']}")
-
-            # Ack message
-            await message.ack()
-            logger.info(f"[AI Consumer] ✅ Successfully enriched job: {job_data['posting_url']} (total: {total_duration}ms)")
-            return True
+            return final_data
 
         except Exception as e:
-            logger.error(
-                f"Enrichment failed: {str(e)}",
-                exc_info=True
+            # One line per failure; a full traceback only for a sample, so a
+            # flood of identical failures doesn't burn CPU formatting them
+            self.error_count += 1
+            logger.warning(
+                "Enrichment failed: %s: %s", type(e).__name__, e,
+                exc_info=(self.error_count - 1) % ERROR_TRACEBACK_SAMPLE_RATE == 0
             )
             await self._handle_failed_message(message, str(e))
-            return False
+            return None
+
+    async def _ensure_publisher(self) -> AbstractExchange:
+        """Open the publisher connection/channel on first use (and after a channel loss)"""
+        if self._pub_exchange is not None and not self._pub_channel.is_closed:
+            return self._pub_exchange
+
+        async with self._pub_lock:
+            if self._pub_exchange is None or self._pub_channel.is_closed:
+                if self._pub_conn is None or self._pub_conn.is_closed:
+                    self._pub_conn = await connect_robust(RABBITMQ_URL)
+                # Confirms make publish() wait for the broker, so an ack of the
+                # source message never races ahead of a lost publish
+                self._pub_channel = await self._pub_conn.channel(publisher_confirms=True)
+                self._pub_exchange = await self._pub_channel.get_exchange(ENRICHED_JOBS_EXCHANGE)
+                logger.info("[AI Consumer] Publisher channel ready")
+        return self._pub_exchange
+
+    async def _close_publisher(self):
+        """Close the publisher connection"""
+        if self._pub_conn is not None and not self._pub_conn.is_closed:
+            await self._pub_conn.close()
+        self._pub_conn = None
+        self._pub_channel = None
+        self._pub_exchange = None
 
     async def _publish_to_enriched_queue(self, data: dict):
         """Publish enriched job to enriched_jobs queue"""
         try:
-            connection = await connect_robust(RABBITMQ_URL)
-            async with connection:
-                channel = await connection.channel()
-                exchange = await channel.get_exchange(ENRICHED_JOBS_EXCHANGE)
-
-                message = Message(
-                    body=json.dumps(data).encode(),
-                    delivery_mode=DeliveryMode.PERSISTENT,
-                    content_type="application/json",
-                    headers={
-                        "source_job_id": data.get('id'),
-                        "posting_url": data['posting_url'],
-                        "enrichment_status": data.get('enrichment_status')
-                    }
-                )
-
-                await exchange.publish(message, routing_key=ENRICHED_JOBS_QUEUE)
-                logger.debug(f"Published enriched job to queue: {data['posting_url']}")
+            exchange = await self._ensure_publisher()
+            await exchange.publish(_make_enriched_message(data), routing_key=ENRICHED_JOBS_QUEUE)
+            logger.debug("Published enriched job to queue: %s", data['posting_url'])
 
         except Exception as e:
-            logger.error(f"Failed to publish to enriched queue: {str(e)}")
+            logger.error("Failed to publish to enriched queue: %s", e)
             raise
 
     async def _handle_failed_message(self, message: AbstractIncomingMessage, error: str):
         """Handle failed message with retry logic"""
         try:
-            retry_count = message.headers.get('x-retry-count', 0) if message.headers else 0
+            retry_count = int(message.headers.get('x-retry-count', 0)) if message.headers else 0
             retry_count += 1
 
             if retry_count <= ENRICHMENT_MAX_RETRIES:
                 logger.warning(
-                    f"Requeuing message (attempt {retry_count}/{ENRICHMENT_MAX_RETRIES})"
+                    "Requeuing message (attempt %d/%d)", retry_count, ENRICHMENT_MAX_RETRIES
                 )
-                # Update retry count and requeue
-                await message.nack(requeue=True)
-            else:
-                logger.error(
-                    f"Max retries exceeded, sending to DLQ: {error}"
+                # Republish with the updated retry count (confirmed), then ack
+                await self._ensure_publisher()
+                await requeue_with_retry_count(
+                    self._pub_channel.default_exchange, message, RAW_JOBS_QUEUE, retry_count
                 )
+            else:
+                logger.error("Max retries exceeded, sending to DLQ: %s", error)
                 # Reject and send to DLQ
                 await message.reject(requeue=False)
 
         except Exception as e:
-            logger.error(f"Error handling failed message: {str(e)}")
+            logger.error("Error handling failed message: %s", e)
+            # Don't strand it unsettled - plain requeue if the republish failed
+            if not message.processed:
+                try:
+                    await message.nack(requeue=True)
+                except Exception:
+                    pass
 
     async def start(self):
         """Start the consumer"""
@@ -277,8 +386,13 @@ class AIEnrichmentConsumer:
                 await asyncio.sleep(2)
 
         async with connection:
-            channel = await connection.channel()
-            await channel.set_qos(prefetch_count=ENRICHMENT_BATCH_SIZE * 2)
+            # Consume-only channel: no publisher confirms to negotiate or track;
+            # acks go out as batched multiple=True frames (ack_contiguous)
+            channel = await connection.channel(publisher_confirms=False)
+            # Keep the next batches buffered while one is enriching. Higher
+            # prefetch means fewer idle gaps but more unacked payloads held in
+            # memory (and redelivered on a crash) - tune via the multiplier
+            await channel.set_qos(prefetch_count=ENRICHMENT_BATCH_SIZE * ENRICHMENT_PREFETCH_MULTIPLIER)
 
             queue = await channel.get_queue(RAW_JOBS_QUEUE)
             logger.info(f"Connected to queue: {RAW_JOBS_QUEUE}")
@@ -299,6 +413,7 @@ class AIEnrichmentConsumer:
                 await batch_processor_task
             except asyncio.CancelledError:
                 pass
+            await self._close_publisher()
 
         logger.info("AI Enrichment Consumer stopped")
 
@@ -336,4 +451,5 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    # libuv-backed event loop, same as the job listing consumer
+    uvloop.run(main())
@@ -4,39 +4,300 @@ Consumes enriched jobs from enriched_jobs queue
 Stores in job_listings_golden table
 """
 import asyncio
-import json
 import logging
 import os
+import re
 import signal
 import sys
+import time
+from functools import lru_cache
+import msgpack
+import orjson
+import uvloop
 from datetime import datetime, timezone
-from typing import List
+from typing import Callable, Dict, List, Optional, Set, Tuple, Union
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from aio_pika import connect_robust
-from aio_pika.abc import AbstractIncomingMessage
+from aio_pika.abc import AbstractExchange, AbstractIncomingMessage
 
-from sqlalchemy.sql import func
+from sqlalchemy import bindparam, cast, column, update, values
+from sqlalchemy.orm import Session, configure_mappers
 
-from database import SessionLocal
+from database import SessionLocal, AsyncSessionLocal
 from models import JobListingGolden
-from queue_config import RABBITMQ_URL, ENRICHED_JOBS_QUEUE, ENRICHED_JOBS_DLQ
-from const import ENRICHMENT_MAX_RETRIES
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+from logging_config import configure_logging
+from queue_config import (
+    RABBITMQ_URL, ENRICHED_JOBS_QUEUE, ENRICHED_JOBS_DLQ, ENRICHED_JOBS_CONTENT_TYPE,
+    ack_contiguous, requeue_with_retry_count
+)
+from const import (
+    ENRICHMENT_MAX_RETRIES, GOLDEN_BATCH_SIZE, GOLDEN_BATCH_TIMEOUT,
+    GOLDEN_PREFETCH_MULTIPLIER, GOLDEN_DB_CONCURRENCY, ERROR_TRACEBACK_SAMPLE_RATE
 )
+
+# Configure logging - records are written by a background thread, so the
+# event loop never blocks on stderr
+configure_logging()
 logger = logging.getLogger(__name__)
 
-# Consumer configuration
-BATCH_SIZE = 50
-BATCH_TIMEOUT = 2.0
+# Unacked deliveries the broker may push ahead of the batch being written
+PREFETCH_COUNT = GOLDEN_BATCH_SIZE * GOLDEN_PREFETCH_MULTIPLIER
+
+# Core table shared by the bulk and per-row UPDATEs - no ORM query or
+# attribute instrumentation on the write path. enrichment_version is bumped
+# by the trg_golden_enrichment_version trigger (migration 006) whenever
+# enriched_at is set, so the statements carry plain values only.
+_golden = JobListingGolden.__table__
+
+
+@lru_cache(maxsize=64)
+def _row_update_statement(fields: Tuple[str, ...]):
+    """
+    Per-row UPDATE for one set of enrichment fields, built once and reused.
+    Values are bound at execute time (b_id plus b_<column>), so every row
+    with the same field set shares one statement object and compiled form.
+    """
+    return (
+        update(_golden)
+        .where(_golden.c.id == bindparam('b_id'))
+        .values({field: bindparam(f'b_{field}') for field in fields})
+    )
+
+
+# ISO 8601 shapes datetime.fromisoformat() accepts in practice - anything else
+# is rejected up front instead of paying for a raised ValueError
+_ISO_DATETIME = re.compile(
+    r'\d{4}-\d{2}-\d{2}'
+    r'(?:[T ]\d{2}:\d{2}(?::\d{2}(?:\.\d{1,6})?)?)?'
+    r'(?:Z|[+-]\d{2}(?::?\d{2})?)?'
+)
+
+# Values the LLM uses for "not available", lowercased
+_NA_VALUES = frozenset(('n/a', 'na', 'none', 'null', ''))
+# Longest entry - longer strings can't match, so skip lowercasing them
+_NA_MAX_LENGTH = max(map(len, _NA_VALUES))
+
+# Returned by a field transform to leave the column out of the update
+_SKIP = object()
+
+
+def _truncate(value, max_length: int) -> Optional[str]:
+    """Truncate string to max length, handling None (N/A is kept as a value)"""
+    if value is None:
+        return None
+    return str(value).strip()[:max_length]
+
+
+def _clean_na(value) -> Optional[str]:
+    """Convert N/A to None for optional fields, otherwise return the stripped value"""
+    if value is None:
+        return None
+    value = value.strip() if isinstance(value, str) else str(value).strip()
+    if len(value) <= _NA_MAX_LENGTH and value.lower() in _NA_VALUES:
+        return None
+    return value
+
+
+def _sanitize_currency(currency) -> Optional[str]:
+    """Extract first currency code from potentially malformed LLM output"""
+    currency = _clean_na(currency) if currency else None
+    if not currency:
+        return None
+    # LLM might return "INR|USD|EUR" - just take the first one
+    for separator in ('|', '/', ','):
+        if separator in currency:
+            currency = currency.split(separator)[0].strip()
+    return currency[:10] if currency else None
+
+
+def _safe_number(value, default=None):
+    """Safely convert value to number, treating 0 as valid"""
+    if value is None:
+        return default
+    if isinstance(value, (int, float)):
+        return value if value != 0 else default  # 0 from LLM means "not available"
+    try:
+        num = float(value)
+        return num if num != 0 else default
+    except (ValueError, TypeError):
+        return default
+
+
+def _safe_bool(value, default=False):
+    """Safely convert value to boolean"""
+    if value is None:
+        return default
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, str):
+        return value.lower() in ('true', 'yes', '1')
+    return bool(value)
 
 
+def _interned(transform: Callable) -> Callable:
+    """
+    Memoize a string transform and intern short results. The LLM repeats the
+    same handful of values ("USD", "Senior", "Remote", ...) in nearly every
+    message, so these become dict lookups returning one shared str object.
+    Non-string input (numbers, stray lists) bypasses the cache.
+    """
+    def intern_result(value):
+        result = transform(value)
+        if isinstance(result, str) and len(result) < 64:
+            return sys.intern(result)
+        return result
+
+    cached = lru_cache(maxsize=4096)(intern_result)
+
+    def lookup(value):
+        return cached(value) if isinstance(value, str) else transform(value)
+    return lookup
+
+
+def _optional(max_length: int) -> Callable:
+    """Cleaned and truncated, or None for N/A"""
+    def transform(value):
+        value = _clean_na(value)
+        return value[:max_length] if value else None
+    return _interned(transform)
+
+
+def _na_default(max_length: int) -> Callable:
+    """Cleaned and truncated, stored as 'N/A' rather than NULL when missing"""
+    def transform(value):
+        return (_clean_na(value) or 'N/A')[:max_length]
+    return _interned(transform)
+
+
+# Metadata columns with a handful of distinct values (model, status)
+_metadata_text = _interned(lambda value: _truncate(value, 50))
+
+
+def _location_string(location: dict):
+    """'city, state, country' from whichever parts are present"""
+    parts = [
+        part for part in map(_clean_na, (location.get('city'), location.get('state'), location.get('country')))
+        if part
+    ]
+    return _truncate(', '.join(parts), 255) if parts else _SKIP
+
+
+def _cleaned_list(items):
+    """Drop N/A entries; an empty list is stored as NULL"""
+    if isinstance(items, list):
+        items = [item for item in items if _clean_na(item)]
+    return items or None
+
+
+def _cleaned_benefits(items):
+    """Cleaned benefit strings without N/A entries, NULL if none are left"""
+    if isinstance(items, list):
+        items = [item for item in map(_clean_na, items) if item]
+    return items or None
+
+
+def _skills(skills_list):
+    """Skill dicts with a real skill name; leave the column alone if the LLM returned none"""
+    if not isinstance(skills_list, list) or not skills_list:
+        return _SKIP
+    filtered = [s for s in skills_list if isinstance(s, dict) and _clean_na(s.get('skill'))]
+    return filtered or None
+
+
+def _tech_stack(tech_stack: dict):
+    """All technology arrays merged, de-duplicated in order"""
+    # dict keeps first-seen order with O(1) membership, unlike a list scan
+    all_tech: Dict[str, None] = {}
+    for key in ('technologies', 'frameworks', 'tools', 'databases', 'cloud'):
+        tech_list = tech_stack.get(key, [])
+        if isinstance(tech_list, list):
+            for t in tech_list:
+                cleaned = _clean_na(t)
+                if cleaned:
+                    all_tech[cleaned] = None
+    return list(all_tech) or None
+
+
+# ai_enrichment section -> (key within the section, column, transform).
+# A section the LLM didn't return leaves all of its columns untouched; a key
+# of None passes the whole section to the transform.
+_SECTION_FIELDS: Tuple[Tuple[str, Tuple[Tuple[Optional[str], str, Callable], ...]], ...] = (
+    ('location_normalization', (
+        (None, 'job_location_normalized', _location_string),
+        ('city', 'location_city', _optional(100)),
+        ('state', 'location_state', _optional(100)),
+        ('country', 'location_country', _optional(100)),
+        ('timezone', 'location_timezone', _optional(50)),
+        ('is_remote', 'is_remote', _safe_bool),
+    )),
+    ('currency_normalization', (
+        ('detected_currency', 'currency_raw', _interned(_sanitize_currency)),
+        ('min_salary_usd', 'min_salary_usd', _safe_number),
+        ('max_salary_usd', 'max_salary_usd', _safe_number),
+        ('conversion_rate', 'currency_conversion_rate', _safe_number),
+    )),
+    # Seniority / work arrangement - always set even if N/A
+    ('seniority_level', (
+        ('normalized', 'seniority_level_normalized', _na_default(50)),
+        ('confidence', 'seniority_confidence_score', _safe_number),
+    )),
+    ('work_arrangement', (
+        ('normalized', 'work_arrangement_normalized', _na_default(50)),
+        ('details', 'work_arrangement_raw', _na_default(100)),
+    )),
+    ('scam_detection', (
+        ('score', 'scam_score', lambda value: _safe_number(value, 0)),
+        ('indicators', 'scam_indicators', _cleaned_list),
+    )),
+    ('skills_extraction', (
+        ('skills', 'skills_extracted', _skills),
+    )),
+    ('tech_stack', (
+        (None, 'tech_stack_normalized', _tech_stack),
+    )),
+    # Company insights / role classification - always populate
+    ('company_insights', (
+        ('notable_info', 'company_research',
+         lambda value: _clean_na(value) or 'No additional company information available'),
+        ('industry', 'company_industry', _na_default(100)),
+        ('company_size', 'company_size', _na_default(100)),
+    )),
+    ('benefits', (
+        ('has_stock_options', 'has_stock_options', _safe_bool),
+        ('stock_details', 'stock_options_details', _clean_na),
+        ('other_benefits', 'other_benefits', _cleaned_benefits),
+    )),
+    ('role_classification', (
+        ('primary_role', 'primary_role', _na_default(100)),
+        ('role_category', 'role_category', _na_default(100)),
+        ('is_management', 'is_management', _safe_bool),
+    )),
+)
+
+# A complete enrichment - every section present and every column set - so the
+# warm-up compiles the same UPDATE shape as a typical successful job
+_WARM_UP_ENRICHMENT = {
+    'location_normalization': {
+        'city': 'Warm-up', 'state': 'Warm-up', 'country': 'Warm-up',
+        'timezone': 'UTC', 'is_remote': False,
+    },
+    'currency_normalization': {
+        'detected_currency': 'USD', 'min_salary_usd': 1, 'max_salary_usd': 1, 'conversion_rate': 1,
+    },
+    'seniority_level': {'normalized': 'N/A', 'confidence': 0},
+    'work_arrangement': {'normalized': 'N/A', 'details': 'N/A'},
+    'scam_detection': {'score': 0, 'indicators': ['warm-up']},
+    'skills_extraction': {'skills': [{'skill': 'warm-up'}]},
+    'tech_stack': {'technologies': ['warm-up']},
+    'company_insights': {'notable_info': 'N/A', 'industry': 'N/A', 'company_size': 'N/A'},
+    'benefits': {'has_stock_options': False, 'stock_details': 'N/A', 'other_benefits': ['warm-up']},
+    'role_classification': {'primary_role': 'N/A', 'role_category': 'N/A', 'is_management': False},
+    '_metadata': {'prompt_tokens': 0, 'response_tokens': 0},
+}
+
 class GoldenJobConsumer:
     """
     Consumer to store enriched jobs in job_listings_golden table
@@ -44,112 +305,323 @@ class GoldenJobConsumer:
 
     def __init__(self):
         self.running = False
-        self.message_batch: List[AbstractIncomingMessage] = []
-        self.batch_lock = asyncio.Lock()
-        self.batch_event = asyncio.Event()
+        # Hand-off between the delivery callback and batch_processor; sized to
+        # the prefetch window so put() never blocks a delivery
+        self.queue: asyncio.Queue[AbstractIncomingMessage] = asyncio.Queue(maxsize=PREFETCH_COUNT)
+        # Per-message failures seen, for sampling tracebacks
+        self.error_count = 0
+        # Default exchange on a confirming channel, for republishing retries
+        self.retry_exchange: Optional[AbstractExchange] = None
+        # One session for the consumer's lifetime, opened in start(). Only one
+        # batch writes at a time, so worker threads never share it concurrently
+        self.db: Optional[Session] = None
 
     async def process_message(self, message: AbstractIncomingMessage):
         """Add message to batch"""
-        async with self.batch_lock:
-            self.message_batch.append(message)
-            if len(self.message_batch) >= BATCH_SIZE:
-                self.batch_event.set()
+        await self.queue.put(message)
 
-    async def batch_processor(self):
-        """Process messages in batches"""
-        while self.running:
+    async def _collect_batch(self) -> List[AbstractIncomingMessage]:
+        """
+        Wait for a first message, then drain until the batch is full or
+        GOLDEN_BATCH_TIMEOUT has passed since it arrived. Returns [] on idle timeout.
+        """
+        try:
+            batch = [await asyncio.wait_for(self.queue.get(), timeout=GOLDEN_BATCH_TIMEOUT)]
+        except asyncio.TimeoutError:
+            return []
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + GOLDEN_BATCH_TIMEOUT
+
+        while len(batch) < GOLDEN_BATCH_SIZE:
             try:
-                # Wait for batch to fill or timeout
-                try:
-                    await asyncio.wait_for(
-                        self.batch_event.wait(),
-                        timeout=BATCH_TIMEOUT
-                    )
-                except asyncio.TimeoutError:
-                    pass
+                batch.append(self.queue.get_nowait())
+                continue
+            except asyncio.QueueEmpty:
+                pass
 
-                # Get current batch
-                async with self.batch_lock:
-                    if not self.message_batch:
-                        self.batch_event.clear()
-                        continue
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self.queue.get(), timeout=remaining))
+            except asyncio.TimeoutError:
+                break
 
-                    batch = self.message_batch.copy()
-                    self.message_batch.clear()
-                    self.batch_event.clear()
+        return batch
 
-                # Process batch
-                logger.info(f"[Golden Consumer] ━━━ Processing batch of {len(batch)} enriched jobs ━━━")
-                batch_start = datetime.now(timezone.utc)
-                await self._process_batch(batch)
-                batch_duration = (datetime.now(timezone.utc) - batch_start).total_seconds()
-                logger.info(f"[Golden Consumer] ━━━ Batch completed in {batch_duration:.2f}s ━━━")
+    async def batch_processor(self):
+        """
+        Process messages in batches, pipelined two deep: batch N+1 is collected
+        and decoded while batch N's UPDATE runs. Writes - and so acks - still
+        happen one batch at a time and in order, which ack_contiguous relies on.
+        """
+        write_task: Optional[asyncio.Task] = None
+        try:
+            while self.running:
+                try:
+                    batch = await self._collect_batch()
+                    if not batch:
+                        continue
 
-            except Exception as e:
-                logger.error(f"Error in batch processor: {str(e)}", exc_info=True)
+                    logger.info(f"[Golden Consumer] ━━━ Processing batch of {len(batch)} enriched jobs ━━━")
+                    batch_start_ns = time.monotonic_ns()
+                    # One timestamp for the whole batch (updated_at, enriched_at fallback)
+                    now = datetime.now(timezone.utc)
+                    # One thread hop for the whole batch - a hop per message would cost
+                    # more than it saves, as the GIL serializes the parsing anyway
+                    prepared = await asyncio.to_thread(self._prepare_batch, batch, now)
+
+                    # The previous batch must be settled before this one acks. Its
+                    # failure is its own - this batch is already prepared and must
+                    # still be written, or its messages sit unacked holding prefetch
+                    if write_task is not None:
+                        previous, write_task = write_task, None
+                        try:
+                            await previous
+                        except Exception as e:
+                            logger.error(f"Error in batch processor: {str(e)}", exc_info=True)
+                    write_task = asyncio.create_task(self._process_batch(batch, prepared, batch_start_ns))
 
-    async def _process_batch(self, messages: List[AbstractIncomingMessage]):
+                except Exception as e:
+                    logger.error(f"Error in batch processor: {str(e)}", exc_info=True)
+        finally:
+            if write_task is not None:
+                try:
+                    await write_task
+                except Exception as e:
+                    logger.error(f"Error in batch processor: {str(e)}", exc_info=True)
+
+    async def _process_batch(
+        self,
+        messages: List[AbstractIncomingMessage],
+        prepared: Tuple[
+            List[AbstractIncomingMessage],
+            List[Tuple[AbstractIncomingMessage, str]],
+            List[Tuple[AbstractIncomingMessage, int, str, dict]],
+            int,
+            int
+        ],
+        batch_start_ns: int
+    ):
         """
         Process batch of enriched jobs:
         Jobs already exist in golden table from detail scraping phase.
         We just need to UPDATE them with AI enrichment results using direct UPDATE by ID.
+
+        `prepared` is the _prepare_batch result for `messages`. The set-based
+        UPDATE (_apply_bulk_update) runs in a worker thread so the event loop
+        keeps servicing deliveries and acks. If it fails, rows are retried as
+        independent async transactions.
         """
-        db = SessionLocal()
+        acked_messages, failed_messages, pending, not_found_count, empty_count = prepared
+
         updated_count = 0
+        if pending:
+            updates = [(golden_id, update_values) for _, golden_id, _, update_values in pending]
+            results: List[Union[bool, Exception]]
+            try:
+                updated_ids = await asyncio.to_thread(self._apply_bulk_update, updates)
+                results = [golden_id in updated_ids for golden_id, _ in updates]
+            except Exception as e:
+                logger.warning(f"[Golden Consumer] Bulk update failed, falling back to per-row updates: {str(e)}")
+                results = await self._apply_row_updates(updates)
+
+            for (message, golden_id, posting_url, _), result in zip(pending, results):
+                if isinstance(result, Exception):
+                    failed_messages.append((message, str(result)))
+                elif result:
+                    updated_count += 1
+                    acked_messages.append(message)
+                    logger.debug("[Golden Consumer] Updated job id=%s: %s", golden_id, posting_url)
+                else:
+                    # Ack anyway - a missing job won't appear on retry
+                    not_found_count += 1
+                    acked_messages.append(message)
+                    logger.warning(f"[Golden Consumer] ⚠️ Job not found id={golden_id}: {posting_url}")
+
+        # Settle failures first so the acks below collapse into one
+        # multiple=True frame (batches run one at a time)
+        await asyncio.gather(
+            *(self._handle_failed_message(message, error) for message, error in failed_messages)
+        )
+        await ack_contiguous(messages, acked_messages)
+
+        logger.info(
+            f"[Golden Consumer] 📊 Batch results: "
+            f"✅ {updated_count} updated, ⚠️ {not_found_count} not found, "
+            f"⏭️ {empty_count} empty, ❌ {len(failed_messages)} failed"
+        )
+        batch_duration = (time.monotonic_ns() - batch_start_ns) / 1e9
+        logger.info(f"[Golden Consumer] ━━━ Batch completed in {batch_duration:.2f}s ━━━")
+
+    def _prepare_batch(
+        self, messages: List[AbstractIncomingMessage], now: datetime
+    ) -> Tuple[
+        List[AbstractIncomingMessage],
+        List[Tuple[AbstractIncomingMessage, str]],
+        List[Tuple[AbstractIncomingMessage, int, str, dict]],
+        int,
+        int
+    ]:
+        """
+        Decode messages and build their update params (runs in a worker thread).
+
+        Returns (messages to ack without a write, failed messages with their
+        error, pending (message, id, posting_url, params) updates, count of
+        messages without an id, count of messages with no enrichment to write).
+        """
+        acked_messages: List[AbstractIncomingMessage] = []
+        failed_messages: List[Tuple[AbstractIncomingMessage, str]] = []
+        pending: List[Tuple[AbstractIncomingMessage, int, str, dict]] = []
         not_found_count = 0
-        failed_count = 0
+        empty_count = 0
 
-        try:
-            for message in messages:
-                try:
-                    enriched_data = json.loads(message.body.decode())
-                    posting_url = enriched_data.get('posting_url', 'unknown')
-                    golden_id = enriched_data.get('id')  # This is the golden table ID
-
-                    if not golden_id:
-                        logger.warning(f"[Golden Consumer] ⚠️ No ID in message, skipping: {posting_url}")
-                        await message.ack()
-                        not_found_count += 1
-                        continue
+        for message in messages:
+            try:
+                enriched_data = self._decode_body(message)
+                posting_url = enriched_data.get('posting_url', 'unknown')
+                golden_id = enriched_data.get('id')  # This is the golden table ID
+
+                if not golden_id:
+                    logger.warning(f"[Golden Consumer] ⚠️ No ID in message, skipping: {posting_url}")
+                    acked_messages.append(message)
+                    not_found_count += 1
+                    continue
+
+                # No AI section and no error: the UPDATE would only touch
+                # timestamps (and bump the version) - ack without writing
+                ai = enriched_data.get('ai_enrichment') or {}
+                if 'error' not in ai and not any(ai.get(section_key) for section_key, _ in _SECTION_FIELDS):
+                    logger.warning(f"[Golden Consumer] ⚠️ Empty enrichment, skipping id={golden_id}: {posting_url}")
+                    acked_messages.append(message)
+                    empty_count += 1
+                    continue
+
+                # Build update dict from enrichment data
+                pending.append((message, golden_id, posting_url, self._build_update_params(enriched_data, now)))
 
-                    # Build update dict from enrichment data
-                    update_values = self._build_update_dict(enriched_data)
+            except Exception as e:
+                # One line per failure; a full traceback only for a sample, so
+                # a flood of identical bad payloads doesn't burn CPU formatting them
+                self.error_count += 1
+                logger.warning(
+                    "Failed to parse message: %s: %s", type(e).__name__, e,
+                    exc_info=(self.error_count - 1) % ERROR_TRACEBACK_SAMPLE_RATE == 0
+                )
+                failed_messages.append((message, str(e)))
+
+        return acked_messages, failed_messages, pending, not_found_count, empty_count
 
-                    # Direct UPDATE by ID - no SELECT needed
-                    result = db.query(JobListingGolden).filter(
-                        JobListingGolden.id == golden_id
-                    ).update(update_values, synchronize_session=False)
+    def _apply_bulk_update(self, updates: List[Tuple[int, dict]]) -> Set[int]:
+        """
+        Apply enrichment updates in one transaction (runs in a worker thread).
+        Returns the ids that matched a row; raises if nothing was committed.
+        """
+        db = self.db
+        try:
+            updated_ids = self._bulk_update(db, updates)
+            db.commit()
+            return updated_ids
+        except Exception:
+            db.rollback()
+            raise
+
+    def _warm_up(self) -> None:
+        """
+        Run one bulk UPDATE against a non-existent id and roll it back (runs in
+        a worker thread), so the first real batch doesn't also pay for the pool
+        connect, dialect initialization, mapper configuration and compiling
+        the UPDATE ... FROM (VALUES ...) statement for a fully enriched job.
+        """
+        configure_mappers()
+        params = self._build_update_params(
+            {'ai_enrichment': _WARM_UP_ENRICHMENT}, datetime.now(timezone.utc)
+        )
+        try:
+            self._bulk_update(self.db, [(-1, params)])
+        finally:
+            self.db.rollback()
 
-                    db.commit()
+    async def _apply_row_updates(self, updates: List[Tuple[int, dict]]) -> List[Union[bool, Exception]]:
+        """
+        Fallback when the bulk statement fails: one transaction per job, up to
+        GOLDEN_DB_CONCURRENCY at a time over the async pool, so one bad row
+        doesn't fail the batch and the good ones don't queue behind each other.
 
-                    if result > 0:
-                        updated_count += 1
-                        await message.ack()
-                        logger.info(f"[Golden Consumer] ✅ Updated job id={golden_id}: {posting_url}")
-                    else:
-                        not_found_count += 1
-                        await message.ack()  # Ack anyway - job doesn't exist
-                        logger.warning(f"[Golden Consumer] ⚠️ Job not found id={golden_id}: {posting_url}")
+        Returns one entry per update: True if the row was updated, False if
+        no row has that id, or the exception that rolled back its transaction.
+        """
+        semaphore = asyncio.Semaphore(GOLDEN_DB_CONCURRENCY)
 
+        async def update_one(golden_id: int, update_values: dict) -> Union[bool, Exception]:
+            async with semaphore:
+                try:
+                    statement = _row_update_statement(tuple(update_values))
+                    params = {f'b_{field}': value for field, value in update_values.items()}
+                    params['b_id'] = golden_id
+                    async with AsyncSessionLocal() as db, db.begin():
+                        result = await db.execute(statement, params)
+                    return result.rowcount > 0
                 except Exception as e:
-                    db.rollback()
-                    logger.error(
-                        f"Failed to process message: {str(e)}",
-                        exc_info=True
-                    )
-                    await self._handle_failed_message(message, str(e))
-                    failed_count += 1
-
-            logger.info(
-                f"[Golden Consumer] 📊 Batch results: "
-                f"✅ {updated_count} updated, ⚠️ {not_found_count} not found, ❌ {failed_count} failed"
+                    logger.error(f"Failed to update job id={golden_id}: {str(e)}")
+                    return e
+
+        return list(await asyncio.gather(
+            *(update_one(golden_id, update_values) for golden_id, update_values in updates)
+        ))
+
+    def _bulk_update(self, db: Session, updates: List[Tuple[int, dict]]) -> Set[int]:
+        """
+        UPDATE job_listings_golden ... FROM (VALUES ...) - one statement per
+        distinct set of enrichment fields (normally just one per batch).
+
+        An INSERT ... ON CONFLICT upsert doesn't fit: the proposed rows would
+        lack NOT NULL columns like posting_url, and unknown ids must not be
+        inserted. Returns the ids that matched a row.
+        """
+        # Last update wins if a job appears twice in the batch
+        latest: Dict[int, dict] = {}
+        for golden_id, update_values in updates:
+            latest[golden_id] = update_values
+
+        # Group by field set - fields the AI didn't return must stay untouched.
+        # _build_update_params inserts keys in a fixed order, so the key tuple
+        # identifies the field set without sorting every row's keys
+        groups: Dict[Tuple[str, ...], List[Tuple[int, dict]]] = {}
+        for golden_id, update_values in latest.items():
+            fields = tuple(update_values)
+            groups.setdefault(fields, []).append((golden_id, update_values))
+
+        updated_ids: Set[int] = set()
+        for fields, rows in groups.items():
+            batch = values(
+                column('id', _golden.c.id.type),
+                *(column(field, _golden.c[field].type) for field in fields),
+                name='batch'
+            ).data([
+                (golden_id, *(update_values[field] for field in fields))
+                for golden_id, update_values in rows
+            ])
+
+            # VALUES columns are untyped on the server - cast back to the target type
+            set_values = {field: cast(batch.c[field], _golden.c[field].type) for field in fields}
+
+            result = db.execute(
+                update(_golden)
+                .where(_golden.c.id == batch.c.id)
+                .values(set_values)
+                .returning(_golden.c.id)
             )
+            updated_ids.update(result.scalars())
 
-        except Exception as e:
-            db.rollback()
-            logger.error(f"Batch processing error: {str(e)}", exc_info=True)
-        finally:
-            db.close()
+        return updated_ids
+
+    def _decode_body(self, message: AbstractIncomingMessage) -> dict:
+        """Decode an enriched job - msgpack, or JSON from publishers predating the switch"""
+        if message.content_type == ENRICHED_JOBS_CONTENT_TYPE:
+            return msgpack.unpackb(message.body, raw=False, timestamp=3)
+        return orjson.loads(message.body)
 
     def _parse_datetime(self, dt_string):
         """
@@ -157,6 +629,12 @@ class GoldenJobConsumer:
         """
         if not dt_string:
             return None
+        if isinstance(dt_string, datetime):
+            # Already decoded from a msgpack timestamp
+            return dt_string
+        if not isinstance(dt_string, str) or not _ISO_DATETIME.fullmatch(dt_string):
+            logger.warning(f"Could not parse datetime: {dt_string}")
+            return None
         try:
             # Try parsing ISO format
             return datetime.fromisoformat(dt_string)
@@ -165,210 +643,73 @@ class GoldenJobConsumer:
             logger.warning(f"Could not parse datetime: {dt_string}")
             return None
 
-    def _truncate(self, value: str, max_length: int) -> str:
-        """Truncate string to max length, handling None and N/A"""
-        if value is None:
-            return None
-        value = str(value).strip()
-        # Keep N/A as a valid value instead of converting to None
-        if len(value) > max_length:
-            return value[:max_length]
-        return value
-
-    def _clean_na(self, value: str) -> str:
-        """Convert N/A to None for optional fields, otherwise return value"""
-        if value is None:
-            return None
-        value = str(value).strip()
-        if value.upper() in ('N/A', 'NA', 'NONE', 'NULL', ''):
-            return None
-        return value
-
-    def _sanitize_currency(self, currency: str) -> str:
-        """Extract first currency code from potentially malformed LLM output"""
-        if not currency:
-            return None
-        # LLM might return "INR|USD|EUR" - just take the first one
-        currency = str(currency).strip()
-        if currency.upper() in ('N/A', 'NA', 'NONE', 'NULL'):
-            return None
-        if '|' in currency:
-            currency = currency.split('|')[0].strip()
-        if '/' in currency:
-            currency = currency.split('/')[0].strip()
-        if ',' in currency:
-            currency = currency.split(',')[0].strip()
-        return currency[:10] if currency else None
-
-    def _safe_number(self, value, default=None):
-        """Safely convert value to number, treating 0 as valid"""
-        if value is None:
-            return default
-        if isinstance(value, (int, float)):
-            return value if value != 0 else default  # 0 from LLM means "not available"
-        try:
-            num = float(value)
-            return num if num != 0 else default
-        except (ValueError, TypeError):
-            return default
-
-    def _safe_bool(self, value, default=False):
-        """Safely convert value to boolean"""
-        if value is None:
-            return default
-        if isinstance(value, bool):
-            return value
-        if isinstance(value, str):
-            return value.lower() in ('true', 'yes', '1')
-        return bool(value)
-
-    def _build_update_dict(self, enriched_data: dict) -> dict:
+    def _build_update_params(self, enriched_data: dict, now: datetime) -> dict:
         """
         Build dictionary of fields to update from AI enrichment data.
-        Returns a dict that can be passed directly to SQLAlchemy update().
+        Returns plain column -> value pairs for a Core update(); always
+        includes enriched_at, which is what fires the enrichment_version trigger.
+        Keys are always inserted in the same order (_SECTION_FIELDS order, then
+        metadata), so equal field sets give equal tuple(keys) - the bulk and
+        per-row paths group and cache statements on that.
+        `now` is the batch timestamp, shared by every job in the batch.
         """
-        ai = enriched_data.get('ai_enrichment', {})
-        metadata = ai.get('_metadata', {})
-
-        # Extract AI enrichment fields
-        currency_norm = ai.get('currency_normalization', {})
-        seniority = ai.get('seniority_level', {})
-        work_arr = ai.get('work_arrangement', {})
-        scam = ai.get('scam_detection', {})
-        location = ai.get('location_normalization', {})
-        company = ai.get('company_insights', {})
-        benefits = ai.get('benefits', {})
-        role = ai.get('role_classification', {})
-        tech_stack = ai.get('tech_stack', {})
-        skills = ai.get('skills_extraction', {})
+        # `or {}` rather than a {} default: no throwaway dict per lookup, and
+        # an explicit null from the LLM is handled the same as a missing key
+        ai = enriched_data.get('ai_enrichment') or {}
+        metadata = ai.get('_metadata') or {}
 
-        update = {}
+        # Partial enrichment (Ollama answered but the response didn't parse):
+        # none of the AI sections exist, so only record the status and error
+        if 'error' in ai:
+            return {
+                'enriched_at': self._parse_datetime(enriched_data.get('enriched_at')) or now,
+                'ollama_model_version': _metadata_text(metadata.get('model', 'llama3.2:3b')),
+                'processing_duration_ms': enriched_data.get('processing_duration_ms'),
+                'enrichment_status': _metadata_text(enriched_data.get('enrichment_status', 'partial')),
+                'enrichment_errors': ai.get('error'),
+                'updated_at': now
+            }
 
-        # Location normalization
-        if location:
-            city = self._clean_na(location.get('city'))
-            state = self._clean_na(location.get('state'))
-            country = self._clean_na(location.get('country'))
-            timezone_str = self._clean_na(location.get('timezone'))
-
-            # Build normalized location string
-            location_parts = [p for p in [city, state, country] if p]
-            if location_parts:
-                update['job_location_normalized'] = self._truncate(', '.join(location_parts), 255)
-
-            update['location_city'] = self._truncate(city, 100) if city else None
-            update['location_state'] = self._truncate(state, 100) if state else None
-            update['location_country'] = self._truncate(country, 100) if country else None
-            update['location_timezone'] = self._truncate(timezone_str, 50) if timezone_str else None
-            update['is_remote'] = self._safe_bool(location.get('is_remote'), False)
-
-        # Salary normalization
-        if currency_norm:
-            update['currency_raw'] = self._sanitize_currency(currency_norm.get('detected_currency'))
-            update['min_salary_usd'] = self._safe_number(currency_norm.get('min_salary_usd'))
-            update['max_salary_usd'] = self._safe_number(currency_norm.get('max_salary_usd'))
-            conversion_rate = self._safe_number(currency_norm.get('conversion_rate'))
-            update['currency_conversion_rate'] = conversion_rate
-            if conversion_rate:
-                update['currency_conversion_date'] = datetime.now(timezone.utc)
-
-        # Seniority normalization - always set even if N/A
-        if seniority:
-            normalized_seniority = self._clean_na(seniority.get('normalized'))
-            update['seniority_level_normalized'] = self._truncate(normalized_seniority or 'N/A', 50)
-            update['seniority_confidence_score'] = self._safe_number(seniority.get('confidence'))
-
-        # Work arrangement - always set even if N/A
-        if work_arr:
-            normalized_work = self._clean_na(work_arr.get('normalized'))
-            update['work_arrangement_normalized'] = self._truncate(normalized_work or 'N/A', 50)
-            details = self._clean_na(work_arr.get('details'))
-            update['work_arrangement_raw'] = self._truncate(details or 'N/A', 100)
-
-        # Scam detection
-        if scam:
-            update['scam_score'] = self._safe_number(scam.get('score'), 0)
-            indicators = scam.get('indicators', [])
-            if isinstance(indicators, list):
-                indicators = [i for i in indicators if self._clean_na(i)]
-            update['scam_indicators'] = indicators if indicators else None
-
-        # Skills extraction - store full skills array
-        if skills:
-            skills_list = skills.get('skills', [])
-            if isinstance(skills_list, list) and skills_list:
-                filtered_skills = [s for s in skills_list if isinstance(s, dict) and self._clean_na(s.get('skill'))]
-                update['skills_extracted'] = filtered_skills if filtered_skills else None
-
-        # Tech stack - combine all technology arrays
-        if tech_stack:
-            all_tech = []
-            for key in ['technologies', 'frameworks', 'tools', 'databases', 'cloud']:
-                tech_list = tech_stack.get(key, [])
-                if isinstance(tech_list, list):
-                    for t in tech_list:
-                        cleaned = self._clean_na(t)
-                        if cleaned and cleaned not in all_tech:
-                            all_tech.append(cleaned)
-            update['tech_stack_normalized'] = all_tech if all_tech else None
-
-        # Company insights - always populate
-        if company:
-            notable_info = self._clean_na(company.get('notable_info'))
-            update['company_research'] = notable_info or 'No additional company information available'
-            industry = self._clean_na(company.get('industry'))
-            update['company_industry'] = self._truncate(industry or 'N/A', 100)
-            size = self._clean_na(company.get('company_size'))
-            update['company_size'] = self._truncate(size or 'N/A', 100)
-
-        # Benefits
-        if benefits:
-            update['has_stock_options'] = self._safe_bool(benefits.get('has_stock_options'), False)
-            stock_details = self._clean_na(benefits.get('stock_details'))
-            update['stock_options_details'] = stock_details
-            other = benefits.get('other_benefits', [])
-            if isinstance(other, list):
-                other = [self._clean_na(b) for b in other if self._clean_na(b)]
-            update['other_benefits'] = other if other else None
-
-        # Role classification - always populate
-        if role:
-            primary = self._clean_na(role.get('primary_role'))
-            update['primary_role'] = self._truncate(primary or 'N/A', 100)
-            category = self._clean_na(role.get('role_category'))
-            update['role_category'] = self._truncate(category or 'N/A', 100)
-            update['is_management'] = self._safe_bool(role.get('is_management'), False)
+        update = {}
+        for section_key, fields in _SECTION_FIELDS:
+            section = ai.get(section_key)
+            if not section:
+                continue
+            for key, column_name, transform in fields:
+                value = transform(section if key is None else section.get(key))
+                if value is not _SKIP:
+                    update[column_name] = value
+
+        if update.get('currency_conversion_rate'):
+            update['currency_conversion_date'] = now
 
         # Processing metadata
-        update['enriched_at'] = self._parse_datetime(enriched_data.get('enriched_at')) or datetime.now(timezone.utc)
-        update['ollama_model_version'] = self._truncate(metadata.get('model', 'llama3.2:3b'), 50)
+        update['enriched_at'] = self._parse_datetime(enriched_data.get('enriched_at')) or now
+        update['ollama_model_version'] = _metadata_text(metadata.get('model', 'llama3.2:3b'))
         update['processing_duration_ms'] = enriched_data.get('processing_duration_ms')
-        update['enrichment_status'] = self._truncate(enriched_data.get('enrichment_status', 'completed'), 50)
+        update['enrichment_status'] = _metadata_text(enriched_data.get('enrichment_status', 'completed'))
         update['ai_prompt_tokens'] = metadata.get('prompt_tokens')
         update['ai_response_tokens'] = metadata.get('response_tokens')
 
-        # Store error if present
-        if 'error' in ai:
-            update['enrichment_errors'] = ai.get('error')
-
         # Update metadata
-        update['updated_at'] = datetime.now(timezone.utc)
-        # Increment enrichment_version, handling NULL with coalesce
-        update['enrichment_version'] = func.coalesce(JobListingGolden.enrichment_version, 0) + 1
+        update['updated_at'] = now
 
         return update
 
     async def _handle_failed_message(self, message: AbstractIncomingMessage, error: str):
         """Handle failed message with retry logic"""
         try:
-            retry_count = message.headers.get('x-retry-count', 0) if message.headers else 0
+            retry_count = int(message.headers.get('x-retry-count', 0)) if message.headers else 0
             retry_count += 1
 
             if retry_count <= ENRICHMENT_MAX_RETRIES:
                 logger.warning(
                     f"Requeuing message (attempt {retry_count}/{ENRICHMENT_MAX_RETRIES})"
                 )
-                await message.nack(requeue=True)
+                # Republish with the updated retry count (confirmed), then ack
+                await requeue_with_retry_count(
+                    self.retry_exchange, message, ENRICHED_JOBS_QUEUE, retry_count
+                )
             else:
                 logger.error(
                     f"Max retries exceeded, sending to DLQ: {error}"
@@ -377,6 +718,12 @@ class GoldenJobConsumer:
 
         except Exception as e:
             logger.error(f"Error handling failed message: {str(e)}")
+            # Don't strand it unsettled - plain requeue if the republish failed
+            if not message.processed:
+                try:
+                    await message.nack(requeue=True)
+                except Exception:
+                    pass
 
     async def start(self):
         """Start the consumer"""
@@ -398,12 +745,27 @@ class GoldenJobConsumer:
                 await asyncio.sleep(2)
 
         async with connection:
-            channel = await connection.channel()
-            await channel.set_qos(prefetch_count=BATCH_SIZE * 2)
+            # Consume-only channel: no publisher confirms to negotiate or track;
+            # acks go out as batched multiple=True frames (ack_contiguous)
+            channel = await connection.channel(publisher_confirms=False)
+            # Retries are republished, so they need a channel with confirms
+            retry_channel = await connection.channel()
+            self.retry_exchange = retry_channel.default_exchange
+            # Higher prefetch trades memory for fewer idle gaps between batches
+            await channel.set_qos(prefetch_count=PREFETCH_COUNT)
 
             queue = await channel.get_queue(ENRICHED_JOBS_QUEUE)
             logger.info(f"Connected to queue: {ENRICHED_JOBS_QUEUE}")
 
+            self.db = SessionLocal()
+
+            # Pay connection and statement-compilation costs before the first
+            # batch; a failure here is not fatal, the first batch just runs cold
+            try:
+                await asyncio.to_thread(self._warm_up)
+            except Exception as e:
+                logger.warning("Database warm-up failed: %s", e)
+
             # Start batch processor
             batch_processor_task = asyncio.create_task(self.batch_processor())
 
@@ -420,6 +782,7 @@ class GoldenJobConsumer:
                 await batch_processor_task
             except asyncio.CancelledError:
                 pass
+            self.db.close()
 
         logger.info("Golden Job Storage Consumer stopped")
 
@@ -457,4 +820,5 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    # libuv-backed event loop, same as the job listing consumer
+    uvloop.run(main())
@@ -0,0 +1,10 @@
+# Async database helpers
+from .bulk_insert import (
+    JOB_LISTING_COLUMNS,
+    get_pool,
+    close_pool,
+    bulk_upsert_job_listings,
+    job_listing_record,
+)
+
+__all__ = ["JOB_LISTING_COLUMNS", "get_pool", "close_pool", "bulk_upsert_job_listings", "job_listing_record"]
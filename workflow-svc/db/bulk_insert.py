@@ -0,0 +1,139 @@
+"""
+Bulk insert helpers for scraped job listings
+
+Rows are streamed into a temporary staging table with COPY and moved into
+job_listings with a single INSERT ... ON CONFLICT DO NOTHING, so a whole
+batch costs one round-trip and one commit instead of one per row.
+"""
+import logging
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import asyncpg
+
+from database import POSTGRES_DSN
+
+logger = logging.getLogger(__name__)
+
+STAGING_TABLE = "job_listings_staging"
+
+# Columns written by the bulk path, in record order
+JOB_LISTING_COLUMNS = (
+    "company_title",
+    "job_role",
+    "job_location",
+    "employment_type",
+    "salary_range",
+    "min_salary",
+    "max_salary",
+    "required_experience",
+    "seniority_level",
+    "job_description",
+    "date_posted",
+    "posting_url",
+    "hiring_team",
+    "about_company",
+    "scraper_source",
+    "scraped_at",
+)
+
+_COLUMN_LIST = ", ".join(JOB_LISTING_COLUMNS)
+
+# Global pool (lazily created, same pattern as the RabbitMQ producer connection)
+_pool: Optional[asyncpg.Pool] = None
+
+
+async def get_pool() -> asyncpg.Pool:
+    """
+    Get or create the asyncpg connection pool
+    """
+    global _pool
+    if _pool is None:
+        _pool = await asyncpg.create_pool(POSTGRES_DSN, min_size=1, max_size=10)
+        logger.info("Created asyncpg connection pool")
+    return _pool
+
+
+async def close_pool() -> None:
+    """
+    Close the asyncpg connection pool gracefully
+    """
+    global _pool
+    if _pool is not None:
+        await _pool.close()
+        _pool = None
+        logger.info("Closed asyncpg connection pool")
+
+
+def _to_decimal(value: Any) -> Optional[Decimal]:
+    """Convert a scraped salary value to Decimal, returning None if not numeric"""
+    if value is None or value == "":
+        return None
+    try:
+        return Decimal(str(value))
+    except (InvalidOperation, ValueError):
+        return None
+
+
+def job_listing_record(job_data: Dict[str, Any], scraper: str, scraped_at: datetime) -> Tuple[Any, ...]:
+    """
+    Map a camelCase scraper payload to a record ordered like JOB_LISTING_COLUMNS
+    """
+    return (
+        job_data.get("companyTitle", ""),
+        job_data.get("jobRole", ""),
+        job_data.get("jobLocation"),
+        job_data.get("employmentType"),
+        job_data.get("salaryRange"),
+        _to_decimal(job_data.get("minSalary")),
+        _to_decimal(job_data.get("maxSalary")),
+        job_data.get("requiredExperience"),
+        job_data.get("seniorityLevel"),
+        job_data.get("jobDescription"),
+        job_data.get("datePosted"),
+        job_data.get("postingUrl"),
+        job_data.get("hiringTeam"),
+        job_data.get("aboutCompany"),
+        scraper,
+        scraped_at,
+    )
+
+
+async def bulk_upsert_job_listings(conn: asyncpg.Connection, rows: Sequence[Tuple[Any, ...]]) -> int:
+    """
+    Insert job listing records in one COPY + INSERT round-trip
+
+    Duplicates (posting_url or uq_job_listing_details) are skipped via
+    ON CONFLICT DO NOTHING, both against existing rows and within the batch.
+
+    Args:
+        conn: asyncpg connection
+        rows: Records ordered like JOB_LISTING_COLUMNS (see job_listing_record)
+
+    Returns:
+        Number of rows actually inserted
+    """
+    if not rows:
+        return 0
+
+    async with conn.transaction():
+        # Session-local staging table, emptied automatically at commit
+        await conn.execute(
+            f"CREATE TEMP TABLE IF NOT EXISTS {STAGING_TABLE} "
+            f"ON COMMIT DELETE ROWS "
+            f"AS SELECT {_COLUMN_LIST} FROM job_listings WITH NO DATA"
+        )
+        await conn.copy_records_to_table(
+            STAGING_TABLE,
+            records=rows,
+            columns=JOB_LISTING_COLUMNS,
+        )
+        status = await conn.execute(
+            f"INSERT INTO job_listings ({_COLUMN_LIST}) "
+            f"SELECT {_COLUMN_LIST} FROM {STAGING_TABLE} "
+            f"ON CONFLICT DO NOTHING"
+        )
+
+    # Status string looks like "INSERT 0 <count>"
+    return int(status.split()[-1])
@@ -14,4 +14,4 @@ echo "Running database migrations..."
 python migrate.py
 
 echo "Starting application..."
-exec python -m uvicorn app:app --host 0.0.0.0 --port ${PORT:-8000}
+exec python -m uvicorn app:app --host 0.0.0.0 --port ${PORT:-8000} --loop uvloop
@@ -0,0 +1,39 @@
+"""
+Logging setup for the queue consumers
+
+Records are handed to a QueueHandler and written to stderr by a QueueListener
+thread, so the event loop never blocks on a stream write or flush.
+"""
+import atexit
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+# Background writer, started once per process
+_listener: Optional[QueueListener] = None
+
+
+def configure_logging(level: int = logging.INFO) -> None:
+    """
+    Drop-in replacement for logging.basicConfig() that routes root logging
+    through a background thread. Safe to call more than once.
+    """
+    global _listener
+    if _listener is not None:
+        return
+
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    root = logging.getLogger()
+    root.setLevel(level)
+    root.addHandler(QueueHandler(log_queue))
+
+    _listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+    # Drain whatever is still queued on exit (including sys.exit from signal handlers)
+    atexit.register(_listener.stop)
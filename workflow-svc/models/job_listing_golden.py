@@ -1,7 +1,7 @@
 """
 SQLAlchemy model for enriched/golden job listings
 """
-from sqlalchemy import Column, Integer, String, Text, Numeric, DateTime, Boolean, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, Numeric, DateTime, Boolean, ForeignKey, Index, text
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.sql import func
 from database import Base
@@ -12,10 +12,21 @@ class JobListingGolden(Base):
     Golden/enriched job listings table with AI-enhanced data
     """
     __tablename__ = "job_listings_golden"
+    __table_args__ = (
+        # Covering index for the enrichment scan (see migration 004)
+        Index('ix_golden_scan', 'scraper_source', 'enrichment_status', 'updated_at',
+              postgresql_include=['id', 'posting_url']),
+        # Partial index over the enrichment work queue (see migration 007)
+        Index('ix_golden_enrichment_pending', 'id',
+              postgresql_where=text(
+                  "detail_scrape_status = 'completed' "
+                  "AND (enrichment_status = 'pending' OR enrichment_status IS NULL)"
+              )),
+    )
 
     # Primary key and relationships
     id = Column(Integer, primary_key=True, index=True)
-    source_job_id = Column(Integer, ForeignKey("job_listings.id"), index=True)
+    source_job_id = Column(Integer, ForeignKey("job_listings.id", name="fk_golden_source"), index=True)
     posting_url = Column(Text, nullable=False, unique=True, index=True)
 
     # Core fields
@@ -90,7 +101,7 @@ class JobListingGolden(Base):
 
     # Additional metadata from raw job_listing
     date_posted = Column(String(100))
-    scraper_source = Column(String(100), index=True)
+    scraper_source = Column(String(100))  # Indexed via ix_golden_scan
     scraped_at = Column(DateTime(timezone=True))
 
     # Detail scraping metadata (Phase 1: scrape job URLs for full details)
@@ -108,7 +119,7 @@ class JobListingGolden(Base):
     processing_duration_ms = Column(Integer)
     ai_prompt_tokens = Column(Integer)
     ai_response_tokens = Column(Integer)
-    enrichment_status = Column(String(50), index=True)  # pending, completed, failed
+    enrichment_status = Column(String(50))  # pending, completed, failed
     enrichment_errors = Column(JSONB)
     enrichment_version = Column(Integer, nullable=False, server_default="1")
 
@@ -1,11 +1,12 @@
 """
 RabbitMQ queue configuration and utilities
 """
+import asyncio
 import os
-from typing import Optional
+from typing import List, Optional
 import aio_pika
-from aio_pika import Connection, Channel, Queue, Exchange, ExchangeType
-from aio_pika.abc import AbstractRobustConnection
+from aio_pika import Connection, Channel, Queue, Exchange, ExchangeType, Message, DeliveryMode
+from aio_pika.abc import AbstractRobustConnection, AbstractIncomingMessage, AbstractExchange
 import logging
 
 logger = logging.getLogger(__name__)
@@ -23,6 +24,7 @@ RAW_JOBS_QUEUE = "raw_jobs_for_processing"
 RAW_JOBS_DLQ = "raw_jobs_for_processing_dlq"
 ENRICHED_JOBS_QUEUE = "enriched_jobs"
 ENRICHED_JOBS_DLQ = "enriched_jobs_dlq"
+ENRICHED_JOBS_CONTENT_TYPE = "application/msgpack"  # Payload codec on enriched_jobs
 
 # Exchange names
 JOBS_EXCHANGE = "scraped_jobs_exchange"
@@ -60,14 +62,16 @@ async def get_rabbitmq_connection() -> AbstractRobustConnection:
 
 async def get_rabbitmq_channel() -> Channel:
     """
-    Get or create a RabbitMQ channel
+    Get or create a RabbitMQ channel (for producer)
+
+    No QoS: prefetch only limits deliveries to consumers, and every consumer
+    sets its own on its own channel, sized to its batch (see *_PREFETCH_MULTIPLIER)
     """
     global _channel
     if _channel is None or _channel.is_closed:
         connection = await get_rabbitmq_connection()
         _channel = await connection.channel()
-        await _channel.set_qos(prefetch_count=10)  # Limit concurrent processing
-        logger.info("Created RabbitMQ channel with QoS prefetch_count=10")
+        logger.info("Created RabbitMQ channel")
     return _channel
 
 
@@ -230,6 +234,76 @@ async def setup_queues() -> None:
     logger.info(f"Declared queue: {ENRICHED_JOBS_QUEUE} with DLX routing")
 
 
+async def ack_contiguous(
+    messages: List[AbstractIncomingMessage],
+    to_ack: List[AbstractIncomingMessage]
+) -> None:
+    """
+    Ack `to_ack` with as few basic.ack frames as possible.
+
+    ack(multiple=True) settles every outstanding tag up to and including its
+    own, so a multiple ack may only cover messages being acked here or already
+    settled (nacked/rejected). Messages in `messages` that are still unsettled
+    block that: acks above the first of them go out one by one. Settle
+    failures before calling this and the whole batch is a single frame.
+
+    Only safe for consumers that process one batch at a time on the channel:
+    every unsettled tag lower than the batch's highest must belong to the batch.
+    """
+    ack_tags = {message.delivery_tag for message in to_ack}
+    run_tail: Optional[AbstractIncomingMessage] = None
+    single: List[AbstractIncomingMessage] = []
+    blocked = False
+
+    for message in sorted(messages, key=lambda m: m.delivery_tag):
+        if message.delivery_tag in ack_tags:
+            if blocked:
+                single.append(message)
+            else:
+                run_tail = message
+        elif not message.processed:
+            # Still outstanding - a multiple ack above it would settle it too
+            blocked = True
+
+    await asyncio.gather(
+        *([run_tail.ack(multiple=True)] if run_tail is not None else []),
+        *(message.ack() for message in single),
+        return_exceptions=True
+    )
+
+
+async def requeue_with_retry_count(
+    exchange: AbstractExchange,
+    message: AbstractIncomingMessage,
+    queue_name: str,
+    retry_count: int
+) -> None:
+    """
+    Put a failed message back on its queue with x-retry-count = retry_count.
+
+    nack(requeue=True) redelivers the message with its original headers, so a
+    count kept there never grows and the message never reaches the DLQ.
+    Instead publish a copy with the new count, then ack the original: a crash
+    in between means one extra attempt, never a lost message. `exchange`
+    should be a default exchange (routes by queue name) on a channel with
+    publisher confirms, so the ack can't overtake an unconfirmed publish.
+    """
+    headers = dict(message.headers or {})
+    headers["x-retry-count"] = retry_count
+    await exchange.publish(
+        Message(
+            body=message.body,
+            headers=headers,
+            content_type=message.content_type,
+            content_encoding=message.content_encoding,
+            message_id=message.message_id,
+            delivery_mode=DeliveryMode.PERSISTENT,
+        ),
+        routing_key=queue_name,
+    )
+    await message.ack()
+
+
 async def close_rabbitmq_connection() -> None:
     """
     Close RabbitMQ connection gracefully
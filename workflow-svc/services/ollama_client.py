@@ -1,13 +1,15 @@
 """
 Ollama API client for job listing enrichment
 """
-import json
 import logging
 import os
+import orjson
 from typing import Dict, Any, Optional
 import httpx
 from datetime import datetime, timezone
 
+from const import ERROR_TRACEBACK_SAMPLE_RATE
+
 logger = logging.getLogger(__name__)
 
 
@@ -26,6 +28,8 @@ class OllamaClient:
             pool=30.0        # 30s to acquire connection from pool
         )
         self.max_retries = 2
+        # Parse failures seen, for sampling tracebacks
+        self.parse_error_count = 0
 
     async def enrich_job_listing(self, job_data: dict) -> dict:
         """
@@ -86,7 +90,9 @@ class OllamaClient:
             return enriched_data
 
         except Exception as e:
-            logger.error(f"[Ollama] Enrichment failed: {str(e)}", exc_info=True)
+            # No traceback here - the caller logs (a sample of) them when it
+            # handles the failure, so it isn't formatted twice per job
+            logger.error(f"[Ollama] Enrichment failed: {str(e)}")
             raise
 
     def _build_enrichment_prompt(self, job_data: dict) -> str:
@@ -276,7 +282,8 @@ Return ONLY the JSON object, no markdown code blocks, no explanations before or
                 async with httpx.AsyncClient(timeout=self.timeout) as client:
                     response = await client.post(url, json=payload)
                     response.raise_for_status()
-                    result = response.json()
+                    # Parse the raw bytes - response.json() decodes to str first
+                    result = orjson.loads(response.content)
 
                     # Log response statistics including token usage
                     prompt_tokens = result.get('prompt_eval_count', 0)
@@ -310,7 +317,7 @@ Return ONLY the JSON object, no markdown code blocks, no explanations before or
 
             except Exception as e:
                 last_error = e
-                logger.error(f"[Ollama API] Call failed on attempt {attempt}: {str(e)}", exc_info=True)
+                logger.error(f"[Ollama API] Call failed on attempt {attempt}: {str(e)}")
                 if attempt < self.max_retries:
                     await asyncio.sleep(2)
                     continue
@@ -351,9 +358,9 @@ Return ONLY the JSON object, no markdown code blocks, no explanations before or
 
             # Parse JSON
             try:
-                enriched_data = json.loads(response_text)
+                enriched_data = orjson.loads(response_text)
                 logger.debug(f"[Ollama Parser] Successfully parsed JSON response")
-            except json.JSONDecodeError as e:
+            except orjson.JSONDecodeError as e:
                 logger.error(f"[Ollama Parser] Failed to parse JSON: {str(e)}")
                 logger.error(f"[Ollama Parser] Response text (first 500 chars): {response_text[:500]}")
                 # Return a minimal structure with error info
@@ -385,7 +392,13 @@ Return ONLY the JSON object, no markdown code blocks, no explanations before or
             return enriched_data
 
         except Exception as e:
-            logger.error(f"[Ollama Parser] Failed to parse response: {str(e)}", exc_info=True)
+            # Unparseable LLM output tends to come in bursts - full traceback
+            # only for a sample
+            self.parse_error_count += 1
+            logger.error(
+                f"[Ollama Parser] Failed to parse response: {str(e)}",
+                exc_info=(self.parse_error_count - 1) % ERROR_TRACEBACK_SAMPLE_RATE == 0
+            )
             return {
                 "error": str(e),
                 "raw_response": str(response)[:500]
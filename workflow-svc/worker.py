@@ -15,6 +15,7 @@ from workflows.detail_scrape_workflow import DetailScrapeWorkflow, DetailScrapeC
 from activities.scrape_activities import (
     get_available_scrapers,
     call_scraper_service,
+    store_scrape_results,
 )
 from activities.queue_activities import (
     publish_scrape_results,
@@ -34,6 +35,7 @@ from activities.detail_scrape_activities import (
     get_detail_scrape_stats,
 )
 from queue_config import setup_queues, close_rabbitmq_connection
+from db import close_pool
 
 # Configure logging
 logging.basicConfig(
@@ -84,6 +86,7 @@ async def main():
             # Scrape activities
             get_available_scrapers,
             call_scraper_service,
+            store_scrape_results,
             publish_scrape_results,
             # Enrichment activities
             get_enrichment_chunk_info,
@@ -110,8 +113,9 @@ async def main():
     try:
         await worker.run()
     finally:
-        # Cleanup RabbitMQ connection on shutdown
+        # Cleanup RabbitMQ connection and DB pool on shutdown
         await close_rabbitmq_connection()
+        await close_pool()
 
 
 if __name__ == "__main__":
@@ -3,7 +3,10 @@ from temporalio.common import RetryPolicy
 from datetime import timedelta
 from typing import Dict, Any
 import asyncio
-from const import MAX_PAGES, CONCURRENT_PAGES_PER_SCRAPER, BATCH_DELAY_SECONDS
+
+# const reads os.environ at import - load it outside the workflow sandbox
+with workflow.unsafe.imports_passed_through():
+    from const import MAX_PAGES, CONCURRENT_PAGES_PER_SCRAPER, BATCH_DELAY_SECONDS
 
 @workflow.defn
 class ScrapeWorkflow: